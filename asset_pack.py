@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Pacote de assets - todos os sprites prontos num único arquivo mapeado em memória
+
+Formato (little-endian):
+    cabeçalho: 'SKAP', versão, hash dos geradores, tamanho da tela e altura do
+               chão, tamanho e hash do background.png usado, número de entradas
+    índice: por entrada, nome, largura, altura, se tem transparência e offset
+    dados: pixels BGRA (4 bytes por pixel), cada entrada alinhada em 64 bytes
+
+BGRA é o formato das superfícies com transparência do pygame: os sprites com
+alpha são usados direto das páginas mapeadas, sem cópia, e vários processos
+do jogo na mesma máquina compartilham essas páginas. Fundo e chão (opacos) são
+convertidos para o formato da tela, uma cópia só.
+
+O atlas de sprites (render_cache.SpriteAtlas) também vai pronto no pacote, com
+os parâmetros de montagem no nome da entrada: o jogo desenha direto dele.
+
+Uso: python asset_pack.py build [--output assets/sprites.skpack]
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import time
+
+import pygame
+
+from render_cache import SpriteAtlas, ATLAS_MAX_WIDTH, ATLAS_ALIGNMENT
+from sprite_cache import generator_hash
+
+ASSET_PACK_PATH = 'assets/sprites.skpack'
+MAGIC = b'SKAP'
+VERSION = 1
+HEADER = struct.Struct('<4sH16sHHHQ8sI')
+ENTRY = struct.Struct('<32sIII4xQ')  # nome, largura, altura, tem alpha, offset
+ALIGNMENT = 64
+PIXEL_FORMAT = 'BGRA'
+# Entrada do atlas; outra largura ou alinhamento montaria outro atlas
+ATLAS_ENTRY = f'atlas:{ATLAS_MAX_WIDTH}:{ATLAS_ALIGNMENT}'
+
+def background_stamp(path):
+    """(tamanho, hash) do arquivo de background usado no pacote; vazio se gerado
+
+    O conteúdo (e não a data) identifica o arquivo: copiar ou extrair do ZIP
+    de entrega muda a data, mas o pacote continua valendo.
+    """
+    if path is None:
+        return 0, bytes(8)
+    with open(path, 'rb') as f:
+        data = f.read()
+    return len(data), hashlib.sha256(data).digest()[:8]
+
+class AssetPack:
+    """Pacote aberto com mmap; cada entrada vira uma superfície sobre os bytes mapeados"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_index()
+        except Exception:
+            # Pacote inválido: não deixar o arquivo mapeado
+            self._map.close()
+            raise
+
+    def _read_index(self):
+        try:
+            (magic, version, generator, width, height, ground_height,
+             background_size, background_digest, count) = HEADER.unpack_from(self._map)
+        except struct.error:
+            raise ValueError("Pacote de assets incompleto")
+        if magic != MAGIC:
+            raise ValueError("Arquivo não é um pacote de assets")
+        if version != VERSION:
+            raise ValueError(f"Versão de pacote não suportada: {version}")
+        self.generator = generator.decode('ascii')
+        self.screen_size = (width, height, ground_height)
+        self.background_stamp = (background_size, background_digest)
+        self.entries = {}
+        for index in range(count):
+            name, entry_width, entry_height, alpha, offset = \
+                ENTRY.unpack_from(self._map, HEADER.size + index * ENTRY.size)
+            if offset + entry_width * entry_height * 4 > len(self._map):
+                raise ValueError("Pacote de assets corrompido: entrada fora do arquivo")
+            self.entries[name.rstrip(b'\0').decode('utf-8')] = (entry_width, entry_height, bool(alpha), offset)
+
+    @classmethod
+    def open(cls, path):
+        """Pacote do caminho dado, ou None se não existir ou for inválido"""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError) as e:
+            print(f"Pacote de assets ignorado ({path}): {e}")
+            return None
+
+    def is_current(self, screen_width, screen_height, ground_height, background_path):
+        """Se o pacote foi gerado com estes tamanhos, este background e os geradores atuais"""
+        if self.screen_size != (screen_width, screen_height, ground_height):
+            return False
+        if self.background_stamp != background_stamp(background_path):
+            return False
+        # O executável empacotado leva o pacote gerado junto com ele; sem o
+        # código-fonte o hash dos geradores seria outro, então não é conferido
+        return getattr(sys, 'frozen', False) or self.generator == generator_hash()
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def surface(self, name):
+        """Superfície da entrada, ou None se o pacote não a tiver"""
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        width, height, alpha, offset = entry
+        pixels = memoryview(self._map)[offset:offset + width * height * 4]
+        surface = pygame.image.frombuffer(pixels, (width, height), PIXEL_FORMAT)
+        if not alpha:
+            return surface.convert()
+        if surface.get_masks() != _alpha_masks():
+            return surface.convert_alpha()
+        return surface  # Já no formato da tela: fica sobre as páginas mapeadas
+
+def _alpha_masks():
+    # Formato que convert_alpha() produz nesta tela
+    return pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+
+def pack_entries(screen_width, screen_height, ground_height):
+    """(nome, superfície sem conversão, tem alpha) de todos os assets, e o background usado"""
+    from assets import OBSTACLE_SPRITE_SIZES, BACKGROUND_PATHS
+    from sprite_generator import (
+        PLAYER_STATES, render_player_pose, render_obstacle_sprite, render_background, render_ground_sprite
+    )
+
+    def from_raw(raw):
+        return pygame.image.frombuffer(raw.data, raw.size, raw.mode)
+
+    entries = []
+    background_path = next((path for path in BACKGROUND_PATHS if os.path.exists(path)), None)
+    if background_path is not None:
+        background = pygame.transform.scale(pygame.image.load(background_path), (screen_width, screen_height))
+    else:
+        background = from_raw(render_background(screen_width, screen_height))
+    entries.append(('background', background, False))
+    entries.append(('ground', from_raw(render_ground_sprite(screen_width, screen_height - ground_height)), False))
+    # Chaves e ordem iguais às de AssetManager.atlas: a montagem sai igual
+    sprites = {}
+    for state in PLAYER_STATES:
+        sprites['player', state] = from_raw(render_player_pose(state))
+        entries.append((f'player:{state}', sprites['player', state], True))
+    for obstacle_type, (width, height) in OBSTACLE_SPRITE_SIZES.items():
+        sprites['obstacle', obstacle_type] = from_raw(render_obstacle_sprite(obstacle_type, width, height))
+        entries.append((f'obstacle:{obstacle_type}', sprites['obstacle', obstacle_type], True))
+    placements, size = SpriteAtlas.layout({key: sprite.get_size() for key, sprite in sprites.items()})
+    entries.append((ATLAS_ENTRY, SpriteAtlas.compose(sprites, placements, size), True))
+    return entries, background_path
+
+def build_pack(path=ASSET_PACK_PATH, screen_width=1000, screen_height=600, ground_height=500):
+    """Gera o pacote a partir dos geradores atuais e do background em disco"""
+    entries, background_path = pack_entries(screen_width, screen_height, ground_height)
+    count = len(entries)
+    offset = HEADER.size + count * ENTRY.size
+    index = bytearray()
+    blobs = []
+    for name, surface, alpha in entries:
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        width, height = surface.get_size()
+        index += ENTRY.pack(name.encode('utf-8'), width, height, alpha, offset)
+        blobs.append((offset, pygame.image.tobytes(surface, PIXEL_FORMAT)))
+        offset += width * height * 4
+
+    header = HEADER.pack(MAGIC, VERSION, generator_hash().encode('ascii'), screen_width, screen_height,
+                         ground_height, *background_stamp(background_path), count)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        f.write(index)
+        for blob_offset, data in blobs:
+            f.write(bytes(blob_offset - f.tell()))
+            f.write(data)
+    # Troca atômica: quem abrir o pacote nunca vê um arquivo pela metade
+    os.replace(temp_path, path)
+    return count, os.path.getsize(path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pacote de assets mapeado em memória")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="gerar o pacote a partir dos geradores atuais")
+    build.add_argument('--output', default=ASSET_PACK_PATH)
+    build.add_argument('--width', type=int, default=1000)
+    build.add_argument('--height', type=int, default=600)
+    build.add_argument('--ground-height', type=int, default=500)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    count, size = build_pack(args.output, args.width, args.height, args.ground_height)
+    elapsed = time.perf_counter() - start
+    print(f"Pacote gerado: {args.output} ({count} assets, {size / 1024:.0f} KB, {elapsed * 1000:.0f} ms)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
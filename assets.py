@@ -1,100 +1,489 @@
 """
 Gerenciador de Assets - Carrega e gerencia todos os sprites e imagens do jogo
+
+Cada asset é carregado sob demanda no primeiro acesso e guardado; nada é
+gerado duas vezes. O menu só precisa do background, então aparece antes que
+os sprites de jogo existam. preload() gera os sprites que faltam no cache em
+paralelo, em processos separados, e só converte as superfícies aqui.
+
+Se existir um pacote de assets atualizado (python asset_pack.py build), os
+sprites vêm dele, mapeados em memória, sem gerar nem decodificar nada.
+
+Com render_scale < 1 (renderização em resolução interna menor), cada asset é
+reduzido uma vez, ao ser carregado, para o tamanho em que será desenhado.
+
+AssetLoader faz esse trabalho numa thread, para a janela aparecer logo com uma
+tela de carregamento; só a conversão para o formato da tela fica na thread
+principal.
 """
 import pygame
 import os
+import threading
+import time
+from asset_pack import AssetPack, ASSET_PACK_PATH, ATLAS_ENTRY
+from render_cache import (
+    RotationCache, SpriteAtlas, ROTATION_STEP, ROTATION_MEMORY_BUDGET, ATLAS_MAX_WIDTH, ATLAS_ALIGNMENT
+)
+from sprite_cache import SpriteCache
 from sprite_generator import (
-    create_player_sprites_animated,
-    create_obstacle_sprite,
-    create_background,
-    create_ground_sprite
+    PLAYER_STATES,
+    RawImage,
+    to_surface,
+    render_player_pose,
+    render_obstacle_sprite,
+    render_background,
+    render_ground_sprite
 )
 
+# Tamanho (largura, altura) do sprite de cada tipo de obstáculo
+OBSTACLE_SPRITE_SIZES = {
+    'barrier': (30, 60),
+    'low_barrier': (30, 30),
+    'ramp': (60, 50),  # Rampas mais altas
+    'rail': (40, 10)
+}
+
+# Poses desenhadas rotacionadas nas manobras (spin360 usa a pose de ollie)
+ROTATED_PLAYER_STATES = ('ollie', 'kickflip')
+
+# Procura em várias localizações possíveis
+BACKGROUND_PATHS = [
+    'assets/background.jpg',
+    'assets/background.png',
+    'background.jpg',
+    'background.png',
+    'assets/images/background.jpg',
+    'assets/images/background.png'
+]
+
+MUSIC_PATHS = [
+    'assets/music.mp3',
+    'assets/music.ogg',
+    'assets/music.wav',
+    'music.mp3',
+    'music.ogg',
+    'music.wav',
+    'assets/sounds/music.mp3',
+    'assets/sounds/music.ogg',
+    'assets/sounds/music.wav'
+]
+
+def render_raw(render, params):
+    """Executa um gerador num processo do pool; os pixels voltam como bytes"""
+    raw = render(*params)
+    return RawImage(bytes(raw.data), raw.size, raw.mode)
+
 class AssetManager:
-    def __init__(self):
+    def __init__(self, screen_width=1000, screen_height=600, ground_height=500, cache_dir=None, use_cache=True,
+                 rotation_step=ROTATION_STEP, rotation_smooth=False, rotation_budget=ROTATION_MEMORY_BUDGET,
+                 workers=None, pack_path=ASSET_PACK_PATH, render_scale=1.0):
+        # Cache em disco dos pixels gerados: inicializações seguintes não redesenham nada
+        self.sprite_cache = SpriteCache(cache_dir) if use_cache else None
+        # Pacote pré-gerado; só é usado se corresponder aos tamanhos e geradores atuais
+        self.asset_pack = AssetPack.open(pack_path)
+        self._pack_current = None
+        # Rotações pré-geradas dos sprites usados nas manobras
+        self.rotation_cache = RotationCache(rotation_step, rotation_smooth, rotation_budget)
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.ground_height = ground_height
+        # Fração do tamanho da tela em que o jogo é desenhado (sprites, fundo e chão nessa escala)
+        self.render_scale = render_scale
+        # Processos usados por preload() (1 = gerar tudo no processo principal)
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._prerendered = {}  # (nome, parâmetros) -> RawImage gerado pelo pool
         self.player_sprites = {}
         self.obstacle_sprites = {}
-        self.background = None
-        self.ground = None
+        self._atlas = None
+        self._originals = {}  # Chave do asset -> superfície no tamanho original (com render_scale < 1)
         self.background_image_path = None
-        self.music_path = None
-        self.load_assets()
-    
+        self._decoded_background = None  # (caminho, superfície sem converter) lido pelo AssetLoader
+        self.load_timings = {}  # Nome do asset -> segundos gastos para carregar
+        self._background = None
+        self._ground = None
+        self._music_path = None
+        self._music_searched = False
+
     def load_assets(self, screen_width=1000, screen_height=600, ground_height=500):
-        """Carrega todos os assets do jogo"""
-        # Carregar sprites do jogador
-        self.player_sprites = create_player_sprites_animated()
-        
-        # Carregar sprites de obstáculos
-        self.obstacle_sprites['barrier'] = create_obstacle_sprite('barrier', 30, 60)
-        self.obstacle_sprites['low_barrier'] = create_obstacle_sprite('low_barrier', 30, 30)
-        self.obstacle_sprites['ramp'] = create_obstacle_sprite('ramp', 60, 50)  # Rampas mais altas
-        self.obstacle_sprites['rail'] = create_obstacle_sprite('rail', 40, 10)
-        
-        # Tentar carregar imagem de background real
-        # Procura em várias localizações possíveis
-        possible_bg_paths = [
-            'assets/background.jpg',
-            'assets/background.png',
-            'background.jpg',
-            'background.png',
-            'assets/images/background.jpg',
-            'assets/images/background.png'
-        ]
-        
-        background_loaded = False
-        for path in possible_bg_paths:
+        """Define o tamanho da tela; assets de outro tamanho serão recarregados sob demanda"""
+        self._pack_current = None
+        if (screen_width, screen_height) != (self.screen_width, self.screen_height):
+            self._background = None
+            self._decoded_background = None
+            self._ground = None
+        elif ground_height != self.ground_height:
+            self._ground = None
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.ground_height = ground_height
+
+    def scaled(self, length):
+        """Comprimento em pixels do jogo convertido para a escala de renderização"""
+        return max(1, round(length * self.render_scale))
+
+    @property
+    def render_size(self):
+        return self.scaled(self.screen_width), self.scaled(self.screen_height)
+
+    def _fitted(self, key, size, load, *args):
+        """Asset carregado no tamanho original e reduzido uma vez para a escala de renderização
+
+        size=None: o tamanho do próprio asset na escala. Os geradores, o cache e
+        o pacote continuam no tamanho original; só a superfície final muda. O
+        original fica guardado (ver original()).
+        """
+        surface = load(*args)
+        if self.render_scale == 1:
+            return surface
+        self._originals[key] = surface
+        if size is None:
+            size = tuple(self.scaled(length) for length in surface.get_size())
+        return pygame.transform.smoothscale(surface, size)
+
+    def preload(self):
+        """Carrega agora todos os assets que ainda não foram carregados"""
+        self._render_missing()
+        for state in PLAYER_STATES:
+            self.get_player_sprite(state)
+        for obstacle_type in OBSTACLE_SPRITE_SIZES:
+            self.get_obstacle_sprite(obstacle_type)
+        self.atlas
+        self.prebake_rotations()
+        self.background
+        self.ground
+        self.music_path
+
+    def _pending_jobs(self):
+        """Assets gerados que ainda não foram carregados nem gerados: (nome, gerador, parâmetros)"""
+        jobs = []
+        if (self._background is None and self._find_background_file() is None and
+                not self._in_pack('background')):
+            jobs.append(('background', render_background, (self.screen_width, self.screen_height)))
+        if self._ground is None and not self._in_pack('ground'):
+            jobs.append(('ground', render_ground_sprite,
+                         (self.screen_width, self.screen_height - self.ground_height)))
+        for state in PLAYER_STATES:
+            if state not in self.player_sprites and not self._in_pack(f'player:{state}'):
+                jobs.append(('player', render_player_pose, (state,)))
+        for obstacle_type, (width, height) in OBSTACLE_SPRITE_SIZES.items():
+            if obstacle_type not in self.obstacle_sprites and not self._in_pack(f'obstacle:{obstacle_type}'):
+                jobs.append(('obstacle', render_obstacle_sprite, (obstacle_type, width, height)))
+        return [job for job in jobs if (job[0], job[2]) not in self._prerendered]
+
+    def _in_pack(self, key):
+        """Se o asset pode vir do pacote (existe nele e o pacote está atualizado)"""
+        pack = self.asset_pack
+        if pack is None or key not in pack:
+            return False
+        if self._pack_current is None:
+            self._pack_current = pack.is_current(self.screen_width, self.screen_height, self.ground_height,
+                                                 self._find_background_file())
+            if not self._pack_current:
+                print(f"Pacote de assets desatualizado ({pack.path}), gerando os sprites. "
+                      "Atualize com: python asset_pack.py build")
+        return self._pack_current
+
+    def load_generated(self, key, name, render, *params):
+        """Superfície de um asset gerado: do pacote se possível, senão gerada (ou do cache)"""
+        if self._in_pack(key):
+            return self.asset_pack.surface(key)
+        return self.generate(name, render, *params)
+
+    def _render_missing(self, on_done=None):
+        """Gera em paralelo os assets ausentes do cache em disco
+
+        Só compensa com mais de um asset para gerar e mais de um processo: abrir
+        o pool custa mais que gerar um sprite sozinho. Se o pool falhar, os
+        assets são gerados normalmente, um a um, no processo principal.
+        on_done é chamado a cada asset gerado (progresso do carregamento).
+        """
+        jobs = self._pending_jobs()
+        if self.sprite_cache is not None:
+            jobs = [job for job in jobs if not self.sprite_cache.contains(job[0], job[2])]
+        workers = min(self.workers, len(jobs))
+        if workers < 2:
+            return
+        start = time.perf_counter()
+        try:
+            # Importados só aqui: sem sprites para gerar, o pool nem é carregado
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn e não fork: o pool pode ser criado na thread do AssetLoader, com
+            # as threads do SDL rodando, e um fork nesse estado pode travar
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                futures = [((name, params), pool.submit(render_raw, render, params))
+                           for name, render, params in jobs]
+                for (name, params), future in futures:
+                    raw = future.result()
+                    if self.sprite_cache is not None:
+                        self.sprite_cache.store(name, params, raw)
+                    self._prerendered[name, params] = raw
+                    if on_done is not None:
+                        on_done()
+        except Exception as e:
+            print(f"Geração paralela indisponível, gerando no processo principal: {e}")
+            return
+        self.load_timings['geração paralela'] = time.perf_counter() - start
+        print(f"{len(jobs)} assets gerados em {workers} processos")
+
+    def _timed(self, name, load, *args):
+        start = time.perf_counter()
+        asset = load(*args)
+        self.load_timings[name] = time.perf_counter() - start
+        return asset
+
+    def report_load_timings(self):
+        """Mostra o tempo de carregamento de cada asset"""
+        total = sum(self.load_timings.values())
+        print(f"Assets carregados em {total * 1000:.1f} ms:")
+        for name, seconds in sorted(self.load_timings.items(), key=lambda item: -item[1]):
+            print(f"  {name}: {seconds * 1000:.1f} ms")
+
+    def generate(self, name, render, *params):
+        """Superfície de um asset gerado, lida do cache em disco quando possível"""
+        raw = self._prerendered.pop((name, params), None)
+        if raw is not None:
+            # Já gerado (pelo pool ou pelo AssetLoader) e guardado no cache: só converter
+            return to_surface(raw)
+        if self.sprite_cache is None:
+            return to_surface(render(*params))
+        return to_surface(self.sprite_cache.get(name, render, *params))
+
+    @property
+    def background(self):
+        if self._background is None:
+            self._background = self._timed('background', self._fitted, 'background', self.render_size, self._load_background)
+        return self._background
+
+    def _find_background_file(self):
+        for path in BACKGROUND_PATHS:
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _decode_background_file(self):
+        """(caminho, imagem redimensionada) do primeiro background que abrir, ou (None, None)
+
+        Não converte para o formato da tela, então pode rodar fora da thread principal.
+        """
+        for path in BACKGROUND_PATHS:
             if os.path.exists(path):
                 try:
                     bg_image = pygame.image.load(path)
                     # Redimensionar para o tamanho da tela
-                    self.background = pygame.transform.scale(bg_image, (screen_width, screen_height))
-                    self.background_image_path = path
-                    background_loaded = True
-                    print(f"Background carregado: {path}")
-                    break
+                    return path, pygame.transform.scale(bg_image, (self.screen_width, self.screen_height))
                 except Exception as e:
                     print(f"Erro ao carregar background {path}: {e}")
+        return None, None
+
+    def _load_background(self):
+        if self._in_pack('background'):
+            self.background_image_path = self._find_background_file()
+            return self.asset_pack.surface('background')
         
+        # Tentar carregar imagem de background real (talvez já lida pelo AssetLoader)
+        path, background = self._decoded_background or self._decode_background_file()
+        self._decoded_background = None
+        if background is not None:
+            self.background_image_path = path
+            print(f"Background carregado: {path}")
+            return background.convert()
+
         # Se não encontrou imagem, usar background gerado
-        if not background_loaded:
-            self.background = create_background(screen_width, screen_height)
-            print("Usando background gerado programaticamente")
-        
-        # Carregar chão
-        self.ground = create_ground_sprite(screen_width, screen_height - ground_height)
-        
+        print("Usando background gerado programaticamente")
+        return self.generate('background', render_background, self.screen_width, self.screen_height)
+
+    @property
+    def ground(self):
+        if self._ground is None:
+            # Na escala, o chão tem de começar onde o fundo escalado termina
+            width, height = self.render_size
+            self._ground = self._timed('ground', self._fitted, 'ground', (width, height - self.scaled(self.ground_height)),
+                                       self.load_generated, 'ground', 'ground', render_ground_sprite,
+                                       self.screen_width, self.screen_height - self.ground_height)
+        return self._ground
+
+    @property
+    def music_path(self):
+        if not self._music_searched:
+            self._music_path = self._timed('music', self._find_music)
+            self._music_searched = True
+        return self._music_path
+
+    def _find_music(self):
         # Procurar música de fundo
-        possible_music_paths = [
-            'assets/music.mp3',
-            'assets/music.ogg',
-            'assets/music.wav',
-            'music.mp3',
-            'music.ogg',
-            'music.wav',
-            'assets/sounds/music.mp3',
-            'assets/sounds/music.ogg',
-            'assets/sounds/music.wav'
-        ]
-        
-        for path in possible_music_paths:
+        for path in MUSIC_PATHS:
             if os.path.exists(path):
-                self.music_path = path
                 print(f"Música encontrada: {path}")
-                break
-        
-        if not self.music_path:
-            print("Nenhuma música encontrada. Adicione um arquivo de música em assets/music.mp3 (ou .ogg/.wav)")
-    
+                return path
+        print("Nenhuma música encontrada. Adicione um arquivo de música em assets/music.mp3 (ou .ogg/.wav)")
+        return None
+
     def get_player_sprite(self, state='idle'):
         """Obtém sprite do jogador para o estado atual"""
-        if state in self.player_sprites:
-            return self.player_sprites[state]
-        return self.player_sprites['idle']
-    
+        if state not in PLAYER_STATES:
+            state = 'idle'
+        sprite = self.player_sprites.get(state)
+        if sprite is None:
+            key = f'player:{state}'
+            sprite = self._timed(key, self._fitted, key, None, self.load_generated, key, 'player', render_player_pose, state)
+            self.player_sprites[state] = sprite
+        return sprite
+
+    def original(self, key):
+        """Asset no tamanho original, mesmo com render_scale < 1
+
+        Chaves como as do pacote: 'background', 'ground', 'player:<estado>' e
+        'obstacle:<tipo>'. Carrega o asset se ainda não foi carregado.
+        """
+        kind, _, name = key.partition(':')
+        if kind == 'player':
+            surface = self.get_player_sprite(name)
+        elif kind == 'obstacle':
+            surface = self.get_obstacle_sprite(name)
+        else:
+            surface = getattr(self, kind)
+        return self._originals.get(key, surface)
+
+    def rescaled(self, render_scale):
+        """AssetManager em outra escala de renderização, montado com os assets já carregados
+
+        Só reduz em memória os originais (sem ler cache, pacote ou arquivos nem
+        gerar sprites) e prepara o atlas e as rotações. Usado pelo governador
+        de qualidade ao baixar a resolução interna.
+        """
+        assets = AssetManager(self.screen_width, self.screen_height, self.ground_height, use_cache=False,
+                              rotation_step=self.rotation_cache.angle_step,
+                              rotation_smooth=self.rotation_cache.smooth,
+                              rotation_budget=self.rotation_cache.memory_budget,
+                              workers=1, pack_path=None, render_scale=render_scale)
+        width, height = assets.render_size
+        assets._background = assets._fitted('background', (width, height), self.original, 'background')
+        assets._ground = assets._fitted('ground', (width, height - assets.scaled(self.ground_height)),
+                                        self.original, 'ground')
+        for state in PLAYER_STATES:
+            key = f'player:{state}'
+            assets.player_sprites[state] = assets._fitted(key, None, self.original, key)
+        for obstacle_type in OBSTACLE_SPRITE_SIZES:
+            key = f'obstacle:{obstacle_type}'
+            assets.obstacle_sprites[obstacle_type] = assets._fitted(key, None, self.original, key)
+        assets.background_image_path = self.background_image_path
+        assets._music_path = self.music_path
+        assets._music_searched = True
+        assets.atlas
+        assets.prebake_rotations()
+        return assets
+
+    def get_rotated_player_sprite(self, state, angle):
+        """Sprite do jogador rotacionado (ângulo quantizado, sem transform por frame)"""
+        return self.rotation_cache.get(state, self.get_player_sprite(state), angle)
+
+    def prebake_rotations(self):
+        """Gera as rotações das poses de manobra agora, e não no primeiro frame da manobra"""
+        for state in ROTATED_PLAYER_STATES:
+            sprite = self.get_player_sprite(state)
+            if not self.rotation_cache.is_prebaked(state, sprite):
+                self._timed(f'rotações:{state}', self.rotation_cache.prebake, state, sprite)
+
+    @property
+    def atlas(self):
+        """Atlas com as poses do jogador e os obstáculos
+
+        Chaves ('player', estado) e ('obstacle', tipo). As rotações continuam
+        superfícies separadas no RotationCache. Com o pacote de assets (na
+        escala 1), o atlas vem pronto dele, sobre as páginas mapeadas.
+        """
+        if self._atlas is None:
+            sprites = {('player', state): self.get_player_sprite(state) for state in PLAYER_STATES}
+            for obstacle_type in OBSTACLE_SPRITE_SIZES:
+                sprites['obstacle', obstacle_type] = self.get_obstacle_sprite(obstacle_type)
+            image = None
+            if self.render_scale == 1 and self._in_pack(ATLAS_ENTRY):
+                image = self.asset_pack.surface(ATLAS_ENTRY)
+            self._atlas = self._timed('atlas', SpriteAtlas, sprites, ATLAS_MAX_WIDTH, ATLAS_ALIGNMENT, image)
+        return self._atlas
+
     def get_obstacle_sprite(self, obstacle_type):
         """Obtém sprite de obstáculo"""
-        if obstacle_type in self.obstacle_sprites:
-            return self.obstacle_sprites[obstacle_type]
-        return self.obstacle_sprites['barrier']
+        if obstacle_type not in OBSTACLE_SPRITE_SIZES:
+            obstacle_type = 'barrier'
+        sprite = self.obstacle_sprites.get(obstacle_type)
+        if sprite is None:
+            width, height = OBSTACLE_SPRITE_SIZES[obstacle_type]
+            key = f'obstacle:{obstacle_type}'
+            sprite = self._timed(key, self._fitted, key, None, self.load_generated, key, 'obstacle',
+                                 render_obstacle_sprite, obstacle_type, width, height)
+            self.obstacle_sprites[obstacle_type] = sprite
+        return sprite
+
+class AssetLoader:
+    """Prepara os assets de um AssetManager numa thread, informando o progresso
+
+    A thread só faz o que não depende da tela: procurar os arquivos, ler e
+    redimensionar o background, gerar os sprites (ou lê-los do cache) e
+    conferir o pacote de assets. convert()/convert_alpha() e o mixer ficam na
+    thread principal: finish() converte o que foi preparado, e a música é
+    carregada pelo jogo depois disso.
+    """
+    def __init__(self, asset_manager):
+        self.asset_manager = asset_manager
+        self.total = 1
+        self.done = 0
+        self.stage = "Iniciando"
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name='AssetLoader', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    @property
+    def progress(self):
+        """Fração já carregada, de 0 a 1"""
+        return min(self.done / self.total, 1.0)
+
+    def is_done(self):
+        return not self._thread.is_alive()
+
+    def _advance(self):
+        self.done += 1
+
+    def _run(self):
+        manager = self.asset_manager
+        start = time.perf_counter()
+        try:
+            self.stage = "Procurando arquivos"
+            manager.music_path
+            decode_background = (manager._background is None and not manager._in_pack('background') and
+                                 manager._find_background_file() is not None)
+            jobs = manager._pending_jobs()
+            self.total = len(jobs) + decode_background + 1
+            self.done = 1
+
+            if decode_background:
+                self.stage = "Carregando o cenário"
+                manager._decoded_background = manager._decode_background_file()
+                self.done += 1
+
+            self.stage = "Gerando sprites"
+            manager._render_missing(on_done=self._advance)
+            for name, render, params in manager._pending_jobs():
+                if manager.sprite_cache is not None:
+                    raw = manager.sprite_cache.get(name, render, *params)
+                else:
+                    raw = render(*params)
+                manager._prerendered[name, params] = raw
+                self.done += 1
+            self.stage = "Pronto"
+            print(f"Assets preparados em segundo plano em {(time.perf_counter() - start) * 1000:.1f} ms")
+        except Exception as e:
+            # O que faltar é carregado normalmente em finish()
+            self.error = e
+            print(f"Erro no carregamento em segundo plano: {e}")
 
+    def finish(self):
+        """Espera a thread e converte os assets para o formato da tela (thread principal)"""
+        self._thread.join()
+        self.asset_manager.preload()
+        return self.asset_manager
@@ -0,0 +1,413 @@
+"""
+Simulação em lote - avança milhares de partidas independentes por tick com NumPy
+
+Cada partida mantém seus próprios obstáculos, velocidade e pontuação em arrays
+(estrutura de arrays). As regras reproduzem exatamente Player.update,
+Obstacle.update e Simulation.step, de modo que o resultado de cada partida é
+idêntico ao da simulação escalar com o mesmo gerador e as mesmas entradas.
+"""
+import math
+import random
+import sys
+import time
+
+import numpy as np
+
+from simulation import (
+    Simulation, Player, InputFrame,
+    SCREEN_WIDTH, GRAVITY, GROUND_HEIGHT,
+    TRICK_DURATIONS, TRICK_BONUSES, SPAWN_CHOICES, OBSTACLE_TYPES
+)
+
+# Códigos das manobras (0 = nenhuma)
+TRICK_NAMES = [None, 'ollie', 'kickflip', 'heelflip', 'spin360', 'grind']
+NO_TRICK, OLLIE, KICKFLIP, HEELFLIP, SPIN360, GRIND = range(len(TRICK_NAMES))
+TRICK_DURATION_TABLE = np.array([0] + [TRICK_DURATIONS[name] for name in TRICK_NAMES[1:]])
+TRICK_BONUS_TABLE = np.array([0] + [TRICK_BONUSES[name] for name in TRICK_NAMES[1:]])
+TRICK_RAMP_BONUS_TABLE = np.array([int(bonus * 1.5) for bonus in TRICK_BONUS_TABLE])
+
+# Geometria de cada tipo de obstáculo, lida da tabela da simulação escalar
+OBSTACLE_NAMES = list(OBSTACLE_TYPES)
+RAMP = OBSTACLE_NAMES.index('ramp')
+OBSTACLE_WIDTH = np.array([kind.width for kind in OBSTACLE_TYPES.values()])
+OBSTACLE_HEIGHT = np.array([kind.height for kind in OBSTACLE_TYPES.values()])
+OBSTACLE_Y = np.array([kind.y for kind in OBSTACLE_TYPES.values()])
+OBSTACLE_GRINDABLE = np.array([kind.grindable for kind in OBSTACLE_TYPES.values()])
+
+# Geometria do jogador (x fixo durante toda a partida)
+_player = Player(100, GROUND_HEIGHT - 80, None)
+PLAYER_X = _player.x
+PLAYER_Y = _player.y
+PLAYER_WIDTH = _player.width
+PLAYER_HEIGHT = _player.height
+PLAYER_JUMP_POWER = _player.jump_power
+PLAYER_CENTER_X = _player.x + _player.width // 2
+del _player
+
+NO_SEQUENCE = np.iinfo(np.int64).max
+START_SPEED = 5  # Velocidade inicial de Simulation (a menor da partida)
+
+def obstacle_capacity(spawn_rate, min_spawn_rate, max_speed):
+    """Máximo de obstáculos vivos ao mesmo tempo com estes parâmetros de dificuldade
+
+    Um obstáculo vive do nascimento na borda direita até sair inteiro pela
+    esquerda; na velocidade mais baixa e com o menor intervalo entre
+    obstáculos, é quantos nascem nesse tempo (mais um de folga).
+    """
+    min_speed = min(START_SPEED, max_speed)
+    min_rate = max(min(spawn_rate, min_spawn_rate), 1)
+    lifetime = (SCREEN_WIDTH + OBSTACLE_WIDTH.max() + 1) / min_speed
+    return math.ceil(lifetime / min_rate) + 1
+
+class BatchSimulation:
+    """N partidas avançadas em paralelo, uma por posição dos arrays"""
+    def __init__(self, n_games, seeds=None, capacity=None, spawn_rate=90, min_spawn_rate=60, max_speed=12):
+        self.n_games = n_games
+        if capacity is None:
+            capacity = obstacle_capacity(spawn_rate, min_spawn_rate, max_speed)
+        self.capacity = capacity  # Máximo de obstáculos simultâneos por partida
+        # Mesmos parâmetros de dificuldade de Simulation
+        self.spawn_rate = spawn_rate
+        self.min_spawn_rate = min_spawn_rate
+        self.max_speed = max_speed
+        if seeds is None:
+            seeds = [None] * n_games
+        if len(seeds) != n_games:
+            raise ValueError("É preciso uma semente por partida")
+        self.seeds = list(seeds)
+        self.reset()
+
+    def reset(self):
+        n, k = self.n_games, self.capacity
+        # Um gerador por partida: os sorteios de obstáculos batem com Simulation(rng=random.Random(seed))
+        self.rngs = [random.Random(seed) for seed in self.seeds]
+
+        # Jogador
+        self.y = np.full(n, PLAYER_Y, dtype=np.float64)
+        self.vel_y = np.zeros(n, dtype=np.float64)
+        self.on_ground = np.zeros(n, dtype=bool)
+        self.trick = np.zeros(n, dtype=np.int8)
+        self.trick_progress = np.zeros(n, dtype=np.int64)
+        self.trick_duration = np.zeros(n, dtype=np.int64)
+        self.trick_completed = np.zeros(n, dtype=bool)
+        self.trick_bonus = np.zeros(n, dtype=np.int64)
+        self.queued_trick = np.zeros(n, dtype=np.int8)
+        self.last_keys = np.zeros(n, dtype=np.int64)
+        self.on_ramp = np.zeros(n, dtype=bool)
+        self.ramp_boost = np.zeros(n, dtype=bool)
+
+        # Obstáculos (slots fixos; a ordem da lista é dada pelo número de sequência).
+        # Como em ObstacleTrack, a posição fica no referencial da pista e x na
+        # tela é track_x - distância rolada (mesmo arredondamento de Simulation)
+        self.obstacle_track_x = np.zeros((n, k), dtype=np.float64)
+        self.obstacle_x = np.zeros((n, k), dtype=np.float64)
+        self.distance = np.zeros(n, dtype=np.float64)
+        self.obstacle_type = np.zeros((n, k), dtype=np.int8)
+        # Geometria copiada da tabela ao gerar, para evitar consultas por tick
+        self.obstacle_width = np.zeros((n, k), dtype=np.int64)
+        self.obstacle_height = np.zeros((n, k), dtype=np.int64)
+        self.obstacle_top = np.zeros((n, k), dtype=np.int64)
+        self.obstacle_grindable = np.zeros((n, k), dtype=bool)
+        self.obstacle_ramp = np.zeros((n, k), dtype=bool)
+        self.obstacle_alive = np.zeros((n, k), dtype=bool)
+        self.obstacle_passed = np.zeros((n, k), dtype=bool)
+        self.obstacle_sequence = np.full((n, k), NO_SEQUENCE, dtype=np.int64)
+        self.next_sequence = np.zeros(n, dtype=np.int64)
+
+        # Partida
+        self.score = np.zeros(n, dtype=np.int64)
+        self.speed = np.full(n, START_SPEED, dtype=np.float64)
+        self.obstacle_timer = np.zeros(n, dtype=np.int64)
+        self.obstacle_spawn_rate = np.full(n, self.spawn_rate, dtype=np.int64)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.death_cause = np.full(n, -1, dtype=np.int8)  # Índice em OBSTACLE_NAMES
+
+        self._rows = np.arange(n)
+
+    @property
+    def all_over(self):
+        return bool(self.game_over.all())
+
+    def step(self, keys):
+        """Avança um tick; keys é uma máscara InputFrame (int) ou um array com uma por partida"""
+        keys = np.broadcast_to(np.asarray(keys, dtype=np.int64), (self.n_games,))
+        active = ~self.game_over
+        if not active.any():
+            return
+
+        self.ticks[active] += 1
+        bonus = self._update_players(keys, active)
+        self.score += np.where(bonus > 0, bonus, 0)
+        self._spawn_obstacles(active)
+        self._update_obstacles(active)
+
+        # Aumentar velocidade ao longo do tempo
+        speed_up = active & (self.score > 0) & (self.score % 100 == 0)
+        self.speed[speed_up] = np.minimum(self.speed[speed_up] + 0.1, self.max_speed)
+        self.obstacle_spawn_rate[speed_up] = np.maximum(self.obstacle_spawn_rate[speed_up] - 1, self.min_spawn_rate)
+
+    def _start_trick(self, mask, trick):
+        if np.ndim(trick):
+            trick = trick[mask]
+        self.trick[mask] = trick
+        self.trick_progress[mask] = 0
+        self.trick_completed[mask] = False
+        self.trick_bonus[mask] = 0
+        self.trick_duration[mask] = TRICK_DURATION_TABLE[self.trick[mask]]
+
+    def _reset_trick(self, mask):
+        self.trick[mask] = NO_TRICK
+        self.trick_progress[mask] = 0
+        self.trick_duration[mask] = 0
+        self.trick_completed[mask] = False
+        self.trick_bonus[mask] = 0
+        self.queued_trick[mask] = NO_TRICK
+        self.ramp_boost[mask] = False
+
+    @staticmethod
+    def _trick_for_keys(keys):
+        # Mesma prioridade do Player: esquerda > direita > baixo
+        return np.where(keys & InputFrame.LEFT, KICKFLIP,
+                        np.where(keys & InputFrame.RIGHT, HEELFLIP,
+                                 np.where(keys & InputFrame.DOWN, SPIN360, NO_TRICK)))
+
+    def _first_match(self, matches):
+        """Índice do primeiro obstáculo (na ordem da lista) que satisfaz a máscara"""
+        order = np.where(matches, self.obstacle_sequence, NO_SEQUENCE)
+        return matches.any(axis=1), order.argmin(axis=1)
+
+    def _update_players(self, keys, active):
+        """Equivalente vetorizado de Player.update; retorna o bônus de cada partida"""
+        pressed = keys & ~self.last_keys
+        self.last_keys = np.where(active, keys, self.last_keys)
+        held_trick = self._trick_for_keys(keys)
+        pressed_trick = self._trick_for_keys(pressed)
+
+        # Manobras no ar (tecla pressionada ou mantida)
+        in_air = active & ~self.on_ground
+        can_start = (self.trick == NO_TRICK) | ((self.trick == OLLIE) & (self.trick_progress < 15))
+        self._start_trick(in_air & can_start & (held_trick != NO_TRICK), held_trick)
+
+        # No chão - colocar manobras na fila
+        queue = active & self.on_ground & (pressed_trick != NO_TRICK)
+        self.queued_trick[queue] = pressed_trick[queue]
+
+        # Pulo regular (Ollie)
+        jump = active & self.on_ground & ((keys & (InputFrame.SPACE | InputFrame.UP)) != 0)
+        self.vel_y[jump] = PLAYER_JUMP_POWER
+        self.on_ground[jump] = False
+        from_queue = jump & (self.queued_trick != NO_TRICK)
+        self._start_trick(from_queue, self.queued_trick.copy())
+        self.queued_trick[from_queue] = NO_TRICK
+        self._start_trick(jump & ~from_queue, OLLIE)
+
+        # Atualizar manobra atual
+        bonus = np.zeros(self.n_games, dtype=np.int64)
+        in_trick = active & (self.trick != NO_TRICK)
+        self.trick_progress[in_trick] += 1
+        finished = in_trick & (self.trick_progress >= self.trick_duration)
+        newly_completed = finished & ~self.trick_completed
+        self.trick_completed[newly_completed] = True
+        trick_bonus = np.where(self.ramp_boost, TRICK_RAMP_BONUS_TABLE[self.trick], TRICK_BONUS_TABLE[self.trick])
+        self.trick_bonus[newly_completed] = trick_bonus[newly_completed]
+        # Manobra completa já no chão: retorna o bônus sem aplicar física
+        landed = finished & self.on_ground
+        bonus[landed] = self.trick_bonus[landed]
+        self._reset_trick(landed)
+        physics = active & ~landed
+
+        # Aplicar gravidade e atualizar posição
+        self.vel_y[physics] += GRAVITY
+        self.y[physics] += self.vel_y[physics]
+
+        self._check_grind(physics)
+        self._check_ramp(physics)
+
+        # Colisão com o chão
+        ground_y = GROUND_HEIGHT - PLAYER_HEIGHT
+        grounded = physics & (self.y >= ground_y)
+        self.y[grounded] = ground_y
+        self.vel_y[grounded] = 0
+        self.on_ground[grounded] = True
+        self.on_ramp[grounded] = False
+        with_trick = grounded & (self.trick != NO_TRICK)
+        scored = with_trick & self.trick_completed
+        bonus[scored] = self.trick_bonus[scored]
+        self._reset_trick(with_trick)
+        return bonus
+
+    def _check_grind(self, mask):
+        player_bottom = (self.y + PLAYER_HEIGHT)[:, None]
+        obstacle_top = self.obstacle_top
+        obstacle_right = self.obstacle_x + self.obstacle_width
+        matches = (mask[:, None] & self.obstacle_grindable &
+                   (player_bottom >= obstacle_top - 5) &
+                   (player_bottom <= obstacle_top + 10) &
+                   (PLAYER_CENTER_X >= self.obstacle_x) &
+                   (PLAYER_CENTER_X <= obstacle_right) &
+                   (np.abs(self.vel_y) < 2)[:, None])
+        hit, first = self._first_match(matches)
+        if not hit.any():
+            return
+        self._start_trick(hit & (self.trick != GRIND), GRIND)
+        self.y[hit] = obstacle_top[self._rows, first][hit] - PLAYER_HEIGHT
+        self.vel_y[hit] = 0
+        self.on_ground[hit] = False
+
+    def _check_ramp(self, mask):
+        ramp_width = OBSTACLE_WIDTH[RAMP]
+        ramp_top = OBSTACLE_Y[RAMP]
+        ramp_bottom = ramp_top + OBSTACLE_HEIGHT[RAMP]
+        player_bottom = (self.y + PLAYER_HEIGHT)[:, None]
+        matches = (mask[:, None] & self.obstacle_ramp &
+                   (PLAYER_X + PLAYER_WIDTH > self.obstacle_x) &
+                   (PLAYER_X < self.obstacle_x + ramp_width) &
+                   (player_bottom > ramp_top) &
+                   (self.y[:, None] < ramp_bottom))
+        self.on_ramp[mask] = False
+        hit, first = self._first_match(matches)
+        if not hit.any():
+            return
+        self.on_ramp[hit] = True
+
+        # Posição na rampa (0 = esquerda, 1 = direita)
+        ramp_left = self.obstacle_x[self._rows, first]
+        ramp_pos = (PLAYER_CENTER_X - ramp_left) / ramp_width
+        ramp_center_x = ramp_left + ramp_width // 2
+
+        # Boost ao subir a rampa
+        boost = (hit & (ramp_pos > 0.2) & (ramp_pos < 0.6) & ~self.ramp_boost &
+                 (PLAYER_CENTER_X < ramp_center_x + 10) & (self.vel_y > -8))
+        self.vel_y[boost] = -22
+        self.ramp_boost[boost] = True
+        self._start_trick(boost & (self.trick == NO_TRICK), OLLIE)
+
+        # Superfície da rampa (triangular)
+        up_slope = (ramp_top - ramp_bottom) / (ramp_width // 2)
+        down_slope = (ramp_bottom - ramp_top) / (ramp_width // 2)
+        ramp_y = np.where(PLAYER_CENTER_X < ramp_center_x,
+                          ramp_bottom - ((PLAYER_CENTER_X - ramp_left) * up_slope),
+                          ramp_top + ((PLAYER_CENTER_X - ramp_center_x) * down_slope))
+        on_surface = hit & (self.y + PLAYER_HEIGHT > ramp_y)
+        self.y[on_surface] = ramp_y[on_surface] - PLAYER_HEIGHT
+        self.on_ground[on_surface] = False
+        slow_down = on_surface & (self.vel_y > 0)
+        self.vel_y[slow_down] = np.maximum(self.vel_y[slow_down] * 0.5, 0.5)
+
+    def _spawn_obstacles(self, active):
+        self.obstacle_timer[active] += 1
+        spawn = active & (self.obstacle_timer >= self.obstacle_spawn_rate)
+        self.obstacle_timer[spawn] = 0
+        for game in np.flatnonzero(spawn):
+            obstacle_type = OBSTACLE_NAMES.index(self.rngs[game].choice(SPAWN_CHOICES))
+            slot = int(self.obstacle_alive[game].argmin())
+            if self.obstacle_alive[game, slot]:
+                raise RuntimeError(f"Capacidade de obstáculos ({self.capacity}) excedida na partida {game}")
+            self.obstacle_track_x[game, slot] = SCREEN_WIDTH + self.distance[game]
+            self.obstacle_type[game, slot] = obstacle_type
+            self.obstacle_width[game, slot] = OBSTACLE_WIDTH[obstacle_type]
+            self.obstacle_height[game, slot] = OBSTACLE_HEIGHT[obstacle_type]
+            self.obstacle_top[game, slot] = OBSTACLE_Y[obstacle_type]
+            self.obstacle_grindable[game, slot] = OBSTACLE_GRINDABLE[obstacle_type]
+            self.obstacle_ramp[game, slot] = obstacle_type == RAMP
+            self.obstacle_alive[game, slot] = True
+            self.obstacle_passed[game, slot] = False
+            self.obstacle_sequence[game, slot] = self.next_sequence[game]
+            self.next_sequence[game] += 1
+
+    def _update_obstacles(self, active):
+        alive = self.obstacle_alive & active[:, None]
+        self.distance[active] += self.speed[active]
+        self.obstacle_x = self.obstacle_track_x - self.distance[:, None]
+
+        obstacle_x = self.obstacle_x
+        width = self.obstacle_width
+        height = self.obstacle_height
+        top = self.obstacle_top
+        right = obstacle_x + width
+
+        # Colisão retangular com as mesmas coordenadas truncadas de pygame.Rect
+        player_rect_y = np.trunc(self.y)[:, None]
+        rect_x = np.trunc(obstacle_x)
+        colliding = (alive & ~self.obstacle_ramp &
+                     (PLAYER_X < rect_x + width) & (rect_x < PLAYER_X + PLAYER_WIDTH) &
+                     (player_rect_y < top + height) & (top < player_rect_y + PLAYER_HEIGHT))
+
+        if colliding.any():
+            # Mesma regra de Simulation.is_fatal_collision
+            player_top = self.y[:, None]
+            player_bottom = player_top + PLAYER_HEIGHT
+            player_left = PLAYER_X
+            player_right = PLAYER_X + PLAYER_WIDTH
+            is_on_top = (self.obstacle_grindable &
+                         (player_bottom >= top - 15) & (player_bottom <= top + 20) &
+                         (PLAYER_CENTER_X >= obstacle_x - 15) & (PLAYER_CENTER_X <= right + 15))
+            collision_from_side = (((player_right > obstacle_x) & (player_left < obstacle_x + 5)) |
+                                   ((player_left < right) & (player_right > right - 5)))
+            collision_from_bottom = (player_top < top + height) & (player_bottom < top)
+            fatal = colliding & ~is_on_top & (collision_from_side | collision_from_bottom)
+            dead, first = self._first_match(fatal)
+            self.game_over |= dead
+            self.death_cause[dead] = self.obstacle_type[self._rows, first][dead]
+
+        # Pontuar
+        passed = alive & ~self.obstacle_passed & (right < PLAYER_X)
+        self.obstacle_passed |= passed
+        self.score += 10 * passed.sum(axis=1)
+
+        # Remover obstáculos fora da tela
+        gone = alive & (right < 0)
+        self.obstacle_alive &= ~gone
+        self.obstacle_grindable &= ~gone
+        self.obstacle_ramp &= ~gone
+        self.obstacle_sequence[gone] = NO_SEQUENCE
+
+def compare_with_scalar(n_games=50, ticks=3000, seed=0):
+    """Roda as mesmas partidas nas duas simulações e lista as divergências"""
+    seeds = [seed + game for game in range(n_games)]
+    input_rng = np.random.default_rng(seed)
+    inputs = input_rng.integers(0, 32, size=(ticks, n_games))
+
+    batch = BatchSimulation(n_games, seeds)
+    scalars = [Simulation(rng=random.Random(game_seed)) for game_seed in seeds]
+    for tick in range(ticks):
+        batch.step(inputs[tick])
+        for game, simulation in enumerate(scalars):
+            simulation.step(InputFrame(int(inputs[tick, game])))
+
+    mismatches = []
+    for game, simulation in enumerate(scalars):
+        death_cause = OBSTACLE_NAMES[batch.death_cause[game]] if batch.death_cause[game] >= 0 else None
+        expected = (simulation.score, simulation.ticks, simulation.game_over, simulation.death_cause,
+                    simulation.player.y, simulation.speed)
+        got = (int(batch.score[game]), int(batch.ticks[game]), bool(batch.game_over[game]), death_cause,
+               float(batch.y[game]), float(batch.speed[game]))
+        if expected != got:
+            mismatches.append((game, expected, got))
+    return mismatches
+
+def run_batch(n_games, ticks, seed=0):
+    """Avança n_games partidas com entradas aleatórias e retorna partidas-tick por segundo"""
+    input_rng = np.random.default_rng(seed)
+    batch = BatchSimulation(n_games, [seed + game for game in range(n_games)])
+    start = time.perf_counter()
+    for _ in range(ticks):
+        batch.step(input_rng.integers(0, 32, size=n_games))
+        if batch.all_over:
+            break
+    elapsed = time.perf_counter() - start
+    return int(batch.ticks.sum()) / elapsed if elapsed > 0 else float('inf')
+
+if __name__ == "__main__":
+    # Uso: python batch_simulation.py [partidas] [ticks]
+    n_games = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 3600
+    mismatches = compare_with_scalar()
+    if mismatches:
+        print(f"ERRO: {len(mismatches)} partidas divergem da simulação escalar")
+        for game, expected, got in mismatches[:5]:
+            print(f"  partida {game}: esperado {expected}, obtido {got}")
+        sys.exit(1)
+    print("Simulação em lote confere com a simulação escalar")
+    print(f"{n_games} partidas: {run_batch(n_games, ticks):.0f} partidas-tick/s")
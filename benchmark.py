@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Benchmarks sem janela - mede os caminhos quentes do jogo isoladamente
+
+Uso:
+    python benchmark.py                          # roda tudo e mostra a tabela
+    python benchmark.py --json resultado.json    # salva os resultados
+    python benchmark.py --save-baseline          # grava benchmarks/baseline.json
+    python benchmark.py --baseline benchmarks/baseline.json --threshold 0.2
+
+Cada benchmark mede o tempo por operação (mediana de várias repetições). Com
+--baseline, qualquer benchmark mais lento que a referência além do limite
+(padrão 20%, ajustável por benchmark com --threshold-for nome=0.5) é uma
+regressão e o script termina com código 1. Os cenários de estresse repetem a
+medição com centenas de obstáculos para mostrar como o custo cresce.
+
+Tempos só se comparam na mesma máquina, então não há referência versionada: em
+cada pull request, o workflow benchmarks.yml grava a referência no commit base
+e compara o commit do PR com ela, no mesmo runner.
+"""
+import os
+
+# Sem janela nem áudio: precisa ser definido antes de importar o pygame
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import atexit
+import contextlib
+import io
+import json
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import pygame
+
+import sprite_generator
+from assets import AssetManager, OBSTACLE_SPRITE_SIZES
+from simulation import (
+    Simulation, Player, InputFrame, ObstaclePool, ObstacleTrack,
+    SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_HEIGHT, SPAWN_CHOICES
+)
+
+BASELINE_PATH = 'benchmarks/baseline.json'
+DEFAULT_THRESHOLD = 0.2  # Regressão: mais de 20% mais lento que a referência
+OBSTACLE_COUNTS = [5, 100, 300]  # 5 é uma partida normal; o resto é estresse
+SPAWN_RATES = [90, 5, 1]  # Frames entre obstáculos: ~5, ~40 e ~200 obstáculos na tela
+RENDER_SCALES = [0.5, 0.67]  # Resoluções internas (fração da janela) medidas em draw_game
+MIN_BATCH_SECONDS = 0.05  # Cada repetição roda operações suficientes para durar isso
+REPEAT = 5
+
+def make_track(count, seed=0, asset_manager=None):
+    """Pista com `count` obstáculos espalhados pela tela (sem movimento)"""
+    rng = random.Random(seed)
+    pool = ObstaclePool(asset_manager)
+    track = ObstacleTrack(pool)
+    for i in range(count):
+        x = i * SCREEN_WIDTH / count
+        track.append(pool.acquire(x, rng.choice(SPAWN_CHOICES)))
+    return track
+
+def input_frames(count=256, seed=0):
+    rng = random.Random(seed)
+    return [InputFrame(rng.getrandbits(5)) for _ in range(count)]
+
+# Cada benchmark é uma função que prepara o cenário e retorna a operação a medir
+
+def bench_player_update(obstacles):
+    track = make_track(obstacles)
+    player = Player(100, GROUND_HEIGHT - 80, None)
+    frames = input_frames()
+    state = {'tick': 0}
+
+    def run():
+        state['tick'] += 1
+        player.update(frames[state['tick'] % len(frames)], track)
+    return run
+
+def bench_obstacle_update(obstacles):
+    # Velocidade zero e sem spawn: a pista não muda e cada chamada percorre
+    # a mesma quantidade de obstáculos (movimento, colisão, pontuação, remoção)
+    simulation = Simulation(seed=0)
+    simulation.obstacles = make_track(obstacles)
+    simulation.speed = 0
+    simulation.obstacle_spawn_rate = float('inf')
+
+    def run():
+        simulation.update_obstacles()
+    return run
+
+def bench_simulation_step(spawn_rate):
+    # Tick completo, como o Game.update faz; recomeça ao perder
+    simulation = Simulation(seed=0, spawn_rate=spawn_rate, min_spawn_rate=spawn_rate)
+    frames = input_frames()
+
+    def run():
+        if simulation.game_over:
+            simulation.reset()
+        simulation.step(frames[simulation.ticks % len(frames)])
+    return run
+
+def bench_player_draw_rotation(asset_manager):
+    screen = pygame.display.get_surface()
+    player = Player(100, GROUND_HEIGHT - 200, asset_manager)
+    player.start_trick('spin360')
+    state = {'angle': 0}
+
+    def run():
+        state['angle'] = (state['angle'] + 9) % 360
+        player.rotation = state['angle']
+        player.draw(screen)
+    return run
+
+def bench_draw_game(game, obstacles):
+    game.reset_game()
+    game.simulation.obstacles = make_track(obstacles, asset_manager=game.asset_manager)
+
+    def run():
+        # O cenário rola a cada frame, como na partida
+        game.prev_scroll = game.scroll
+        game.scroll += 7.3
+        game.draw_game(alpha=0.5)
+    return run
+
+def bench_scenery(game, scrolling):
+    """Só o cenário: camadas rolando, ou o fundo e o chão parados (como antes da rolagem)"""
+    screen = game.screen
+    background = game.asset_manager.background
+
+    def run():
+        if scrolling:
+            game.prev_scroll = game.scroll
+            game.scroll += 7.3
+            game.draw_layers(screen, 0.5)
+        else:
+            screen.blit(background, (0, 0))
+            game.draw_scenery(screen)
+    return run
+
+def bench_render(render, *params):
+    def run():
+        render(*params)
+    return run
+
+def bench_asset_startup(cold, workers=None):
+    # A frio: pasta de cache vazia, todos os sprites são gerados (em paralelo,
+    # exceto com workers=1). A quente: sprites lidos do cache em disco
+    # preenchido antes da medição. As mensagens do AssetManager são descartadas.
+    warm_dir = tempfile.mkdtemp(prefix='skategame-bench-')
+    atexit.register(shutil.rmtree, warm_dir, ignore_errors=True)
+    if not cold:
+        with contextlib.redirect_stdout(io.StringIO()):
+            AssetManager(SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_HEIGHT, cache_dir=warm_dir).preload()
+
+    def run():
+        directory = tempfile.mkdtemp(prefix='skategame-bench-') if cold else warm_dir
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                AssetManager(SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_HEIGHT, cache_dir=directory,
+                             workers=workers).preload()
+        finally:
+            if cold:
+                shutil.rmtree(directory, ignore_errors=True)
+    return run
+
+def benchmarks():
+    """Lista de (nome, função que prepara a operação)"""
+    items = []
+    for count in OBSTACLE_COUNTS:
+        items.append((f'player_update[obstacles={count}]', lambda count=count: bench_player_update(count)))
+        items.append((f'obstacle_update[obstacles={count}]', lambda count=count: bench_obstacle_update(count)))
+    for rate in SPAWN_RATES:
+        items.append((f'simulation_step[spawn_rate={rate}]', lambda rate=rate: bench_simulation_step(rate)))
+
+    # Os benchmarks de desenho compartilham a janela e os assets de um Game (um por escala)
+    shared = {}
+
+    def game(render_scale=1.0, smooth_upscale=False):
+        key = (render_scale, smooth_upscale)
+        if key not in shared:
+            import skate_game
+            shared[key] = skate_game.Game(render_scale=render_scale, smooth_upscale=smooth_upscale)
+            shared[key].asset_manager.preload()
+        return shared[key]
+
+    items.append(('player_draw_rotation', lambda: bench_player_draw_rotation(game().asset_manager)))
+    items.append(('scenery[static]', lambda: bench_scenery(game(), scrolling=False)))
+    items.append(('scenery[scroll]', lambda: bench_scenery(game(), scrolling=True)))
+    for count in OBSTACLE_COUNTS:
+        items.append((f'draw_game[obstacles={count}]', lambda count=count: bench_draw_game(game(), count)))
+    for scale in RENDER_SCALES:
+        for count in (OBSTACLE_COUNTS[0], OBSTACLE_COUNTS[-1]):
+            items.append((f'draw_game[obstacles={count},scale={scale}]',
+                          lambda scale=scale, count=count: bench_draw_game(game(scale), count)))
+        items.append((f'draw_game[obstacles={OBSTACLE_COUNTS[0]},scale={scale},smooth]',
+                      lambda scale=scale: bench_draw_game(game(scale, smooth_upscale=True), OBSTACLE_COUNTS[0])))
+
+    for state in sprite_generator.PLAYER_STATES:
+        items.append((f'render_player_pose[{state}]',
+                      lambda state=state: bench_render(sprite_generator.render_player_pose, state)))
+    for obstacle_type, (width, height) in OBSTACLE_SPRITE_SIZES.items():
+        items.append((f'render_obstacle_sprite[{obstacle_type}]',
+                      lambda args=(obstacle_type, width, height):
+                      bench_render(sprite_generator.render_obstacle_sprite, *args)))
+    items.append(('render_background', lambda: bench_render(
+        sprite_generator.render_background, SCREEN_WIDTH, SCREEN_HEIGHT)))
+    items.append(('render_ground_sprite', lambda: bench_render(
+        sprite_generator.render_ground_sprite, SCREEN_WIDTH, SCREEN_HEIGHT - GROUND_HEIGHT)))
+    items.append(('asset_startup[cold]', lambda: bench_asset_startup(cold=True)))
+    items.append(('asset_startup[cold,serial]', lambda: bench_asset_startup(cold=True, workers=1)))
+    items.append(('asset_startup[warm]', lambda: bench_asset_startup(cold=False)))
+    return items
+
+def measure(run, repeat=REPEAT, min_batch=MIN_BATCH_SECONDS):
+    """Mediana e mínimo do tempo por operação, em segundos"""
+    run()  # Aquecimento (caches, primeira alocação)
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_batch or loops >= 1 << 20:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(int(min_batch / elapsed) + 1, 10))
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        samples.append((time.perf_counter() - start) / loops)
+    return statistics.median(samples), min(samples), loops
+
+def run_benchmarks(selected=None, repeat=REPEAT):
+    results = {}
+    for name, setup in benchmarks():
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        median, best, loops = measure(setup(), repeat)
+        results[name] = {'ms': median * 1000, 'min_ms': best * 1000, 'loops': loops, 'repeat': repeat}
+        print(f"  {name:<40} {median * 1000:10.4f} ms  (mín {best * 1000:.4f}, {loops}x{repeat})")
+    return results
+
+def compare(results, baseline, threshold, thresholds=None):
+    """Lista de (nome, referência, atual, variação) que passaram do limite"""
+    thresholds = thresholds or {}
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        change = result['ms'] / reference['ms'] - 1 if reference['ms'] > 0 else 0.0
+        if change > thresholds.get(name, threshold):
+            regressions.append((name, reference['ms'], result['ms'], change))
+    return regressions
+
+def parse_thresholds(items):
+    thresholds = {}
+    for item in items:
+        name, _, value = item.rpartition('=')
+        if not name:
+            raise ValueError(f"use nome=fração, não {item!r}")
+        thresholds[name] = float(value)
+    return thresholds
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos quentes do jogo (sem janela)")
+    parser.add_argument('filters', nargs='*', help="rodar só benchmarks cujo nome contenha algum destes textos")
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="repetições de cada medição")
+    parser.add_argument('--json', help="salvar os resultados neste arquivo")
+    parser.add_argument('--baseline', help="comparar com os resultados guardados neste arquivo")
+    parser.add_argument('--save-baseline', nargs='?', const=BASELINE_PATH, metavar='ARQUIVO',
+                        help=f"guardar os resultados como referência (padrão: {BASELINE_PATH})")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="fração de aumento aceita antes de acusar regressão (padrão: 0.2)")
+    parser.add_argument('--threshold-for', action='append', default=[], metavar='NOME=FRAÇÃO',
+                        help="limite específico de um benchmark (pode repetir)")
+    args = parser.parse_args(argv)
+    try:
+        thresholds = parse_thresholds(args.threshold_for)
+    except ValueError as e:
+        parser.error(f"--threshold-for: {e}")
+
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    print(f"Benchmarks ({platform.python_implementation()} {platform.python_version()}, "
+          f"pygame {pygame.version.ver}, SDL {os.environ['SDL_VIDEODRIVER']}):")
+    results = run_benchmarks(args.filters, args.repeat)
+    report = {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+        'unit': 'ms por operação',
+        'benchmarks': results
+    }
+
+    for path in filter(None, [args.json, args.save_baseline]):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Resultados salvos em {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['benchmarks']
+        regressions = compare(results, baseline, args.threshold, thresholds)
+        if regressions:
+            print(f"{len(regressions)} regressões em relação a {args.baseline}:")
+            for name, reference, current, change in regressions:
+                print(f"  {name}: {reference:.4f} -> {current:.4f} ms (+{change:.0%})")
+            return 1
+        print(f"Sem regressões em relação a {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Analisador de dificuldade - roda muitas partidas com sementes em todos os núcleos
+
+Cada partida é reproduzível pela sua semente (obstáculos e entradas). Os
+resultados voltam dos processos em blocos e são somados em histogramas, então a
+memória não cresce com o número de partidas.
+
+Exemplo:
+    python difficulty_analyzer.py --runs 5000 --policy scripted \\
+        --spawn-rates 90,75,60 --max-speeds 12,15
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from simulation import Simulation, InputFrame, FPS
+
+SCORE_BUCKET = 50  # Largura das faixas do histograma de pontuação
+TIME_BUCKET = FPS  # Faixas de 1 segundo no histograma de tempo até a morte
+SURVIVED = 'sobreviveu'  # Causa registrada quando a partida atinge o limite de tempo
+
+def random_policy(simulation, rng):
+    """Aperta teclas ao acaso, com pulos mais raros que as manobras"""
+    mask = 0
+    if rng.random() < 0.05:
+        mask |= InputFrame.SPACE
+    if rng.random() < 0.3:
+        mask |= rng.choice([InputFrame.LEFT, InputFrame.RIGHT, InputFrame.DOWN])
+    return InputFrame(mask)
+
+def scripted_policy(simulation, rng):
+    """Pula diante de barreiras e faz uma manobra aleatória no ar"""
+    player = simulation.player
+    player_right = player.x + player.width
+    if not player.on_ground:
+        if player.current_trick in (None, 'ollie'):
+            return InputFrame(rng.choice([InputFrame.LEFT, InputFrame.RIGHT, InputFrame.DOWN]))
+        return InputFrame()
+
+    for obstacle in simulation.obstacles:
+        if obstacle.type == 'ramp' or obstacle.x + obstacle.width < player.x:
+            continue
+        # Distância de reação proporcional à velocidade, com um pouco de ruído
+        reaction = simulation.speed * rng.uniform(6, 12)
+        if obstacle.x - player_right <= reaction:
+            return InputFrame(InputFrame.SPACE)
+        break
+    return InputFrame()
+
+POLICIES = {
+    'random': random_policy,
+    'scripted': scripted_policy
+}
+
+def play(seed, policy, max_ticks, **difficulty):
+    """Joga uma partida e retorna (pontuação, ticks, causa da morte)"""
+    simulation = Simulation(rng=random.Random(seed), **difficulty)
+    policy_rng = random.Random(f"{seed}-entrada")
+    while not simulation.game_over and simulation.ticks < max_ticks:
+        simulation.step(policy(simulation, policy_rng))
+    cause = simulation.death_cause if simulation.game_over else SURVIVED
+    return simulation.score, simulation.ticks, cause
+
+class DifficultyStats:
+    """Distribuições agregadas de um conjunto de partidas"""
+    def __init__(self):
+        self.runs = 0
+        self.score_total = 0
+        self.ticks_total = 0
+        self.scores = Counter()  # faixa de pontuação -> partidas
+        self.times = Counter()  # faixa de tempo -> partidas
+        self.deaths = Counter()  # causa -> partidas
+
+    def add(self, score, ticks, cause):
+        self.runs += 1
+        self.score_total += score
+        self.ticks_total += ticks
+        self.scores[score // SCORE_BUCKET] += 1
+        self.times[ticks // TIME_BUCKET] += 1
+        self.deaths[cause] += 1
+
+    def merge(self, other):
+        self.runs += other.runs
+        self.score_total += other.score_total
+        self.ticks_total += other.ticks_total
+        self.scores.update(other.scores)
+        self.times.update(other.times)
+        self.deaths.update(other.deaths)
+
+    @staticmethod
+    def percentile(histogram, fraction):
+        """Início da faixa que contém o percentil pedido"""
+        total = sum(histogram.values())
+        if total == 0:
+            return 0
+        seen = 0
+        for bucket in sorted(histogram):
+            seen += histogram[bucket]
+            if seen >= fraction * total:
+                return bucket
+        return max(histogram)
+
+    def summary(self):
+        runs = max(self.runs, 1)
+        return {
+            'partidas': self.runs,
+            'pontuacao_media': self.score_total / runs,
+            'pontuacao_p50': self.percentile(self.scores, 0.5) * SCORE_BUCKET,
+            'pontuacao_p90': self.percentile(self.scores, 0.9) * SCORE_BUCKET,
+            'tempo_medio_s': self.ticks_total / runs / FPS,
+            'tempo_p50_s': self.percentile(self.times, 0.5) * TIME_BUCKET / FPS,
+            'tempo_p90_s': self.percentile(self.times, 0.9) * TIME_BUCKET / FPS,
+            'mortes': {cause: count / runs for cause, count in self.deaths.most_common()},
+            'histograma_pontuacao': {bucket * SCORE_BUCKET: count for bucket, count in sorted(self.scores.items())},
+            'histograma_tempo_s': {bucket * TIME_BUCKET // FPS: count for bucket, count in sorted(self.times.items())}
+        }
+
+def run_chunk(task):
+    """Executado nos processos: joga um bloco de sementes e devolve as estatísticas"""
+    seeds, policy_name, max_ticks, difficulty = task
+    policy = POLICIES[policy_name]
+    stats = DifficultyStats()
+    for seed in seeds:
+        stats.add(*play(seed, policy, max_ticks, **difficulty))
+    return difficulty, stats
+
+def analyze(configs, runs, first_seed=0, policy='random', max_ticks=FPS * 300, workers=None, chunk_size=64):
+    """Roda `runs` partidas para cada configuração e retorna {configuração: estatísticas}"""
+    seeds = range(first_seed, first_seed + runs)
+    tasks = [
+        (list(seeds[start:start + chunk_size]), policy, max_ticks, config)
+        for config in configs
+        for start in range(0, runs, chunk_size)
+    ]
+    results = {tuple(sorted(config.items())): DifficultyStats() for config in configs}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Cada bloco é somado assim que fica pronto; a soma não depende da ordem dos blocos
+        futures = [executor.submit(run_chunk, task) for task in tasks]
+        for future in as_completed(futures):
+            config, stats = future.result()
+            results[tuple(sorted(config.items()))].merge(stats)
+    return results
+
+def parse_list(text, cast):
+    return [cast(value) for value in text.split(',') if value]
+
+def print_report(config, summary):
+    print(f"spawn_rate={config['spawn_rate']} max_speed={config['max_speed']} "
+          f"min_spawn_rate={config['min_spawn_rate']}")
+    print(f"  Partidas: {summary['partidas']}")
+    print(f"  Pontuação: média {summary['pontuacao_media']:.1f} | "
+          f"p50 {summary['pontuacao_p50']} | p90 {summary['pontuacao_p90']}")
+    print(f"  Tempo até a morte: média {summary['tempo_medio_s']:.1f}s | "
+          f"p50 {summary['tempo_p50_s']:.0f}s | p90 {summary['tempo_p90_s']:.0f}s")
+    deaths = ', '.join(f"{cause} {share:.0%}" for cause, share in summary['mortes'].items())
+    print(f"  Causas: {deaths}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analisa a dificuldade com partidas simuladas em paralelo")
+    parser.add_argument('--runs', type=int, default=1000, help="partidas por configuração")
+    parser.add_argument('--seed', type=int, default=0, help="primeira semente")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='random')
+    parser.add_argument('--max-seconds', type=float, default=300, help="limite de tempo de cada partida")
+    parser.add_argument('--spawn-rates', default='90', help="frames iniciais entre obstáculos (lista)")
+    parser.add_argument('--min-spawn-rates', default='60', help="limite de frames entre obstáculos (lista)")
+    parser.add_argument('--max-speeds', default='12', help="velocidades máximas (lista)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--json', help="salvar o relatório neste arquivo")
+    args = parser.parse_args(argv)
+
+    configs = [
+        {'spawn_rate': spawn_rate, 'min_spawn_rate': min(min_spawn_rate, spawn_rate), 'max_speed': max_speed}
+        for spawn_rate, min_spawn_rate, max_speed in itertools.product(
+            parse_list(args.spawn_rates, int),
+            parse_list(args.min_spawn_rates, int),
+            parse_list(args.max_speeds, float))
+    ]
+    # O limite acima pode repetir configurações: cada uma roda (e aparece) uma vez só
+    configs = [dict(key) for key in dict.fromkeys(tuple(sorted(config.items())) for config in configs)]
+    start = time.perf_counter()
+    results = analyze(configs, args.runs, args.seed, args.policy,
+                      int(args.max_seconds * FPS), args.workers)
+    elapsed = time.perf_counter() - start
+
+    report = []
+    for config in configs:
+        summary = results[tuple(sorted(config.items()))].summary()
+        print_report(config, summary)
+        report.append({'configuracao': config, 'resultado': summary})
+    print(f"{len(configs) * args.runs} partidas em {elapsed:.1f}s")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'politica': args.policy, 'semente': args.seed, 'relatorio': report}, f,
+                      indent=2, ensure_ascii=False)
+        print(f"Relatório salvo em {args.json}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
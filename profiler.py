@@ -0,0 +1,198 @@
+"""
+Perfil de frames - tempo gasto em cada fase do loop do jogo, sem profiler externo
+
+Cada frame é dividido em fases (eventos, jogador, obstáculos, desenho, flip e
+espera do clock). Os tempos ficam num buffer circular de tamanho fixo, mostrados
+num overlay (F3 no jogo) e exportáveis para CSV ou JSON.
+
+StartupProfiler faz o mesmo para a inicialização (--profile-startup no jogo).
+"""
+import csv
+import json
+import os
+import time
+from array import array
+
+import pygame
+
+PHASES = ['events', 'player', 'obstacles', 'draw', 'flip', 'idle']
+PROFILER_CAPACITY = 600  # 10 segundos a 60 FPS
+
+def percentile(sorted_values, fraction):
+    """Percentil de uma lista já ordenada (vizinho mais próximo)"""
+    if not sorted_values:
+        return 0.0
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+class FrameProfiler:
+    """Buffer circular com os tempos (em segundos) de cada fase dos últimos frames"""
+    def __init__(self, capacity=PROFILER_CAPACITY, phases=PHASES):
+        self.capacity = capacity
+        self.phases = list(phases)
+        self.samples = {phase: array('d', bytes(8 * capacity)) for phase in self.phases}
+        self.totals = array('d', bytes(8 * capacity))
+        self.index = 0  # Próxima posição a ser escrita
+        self.count = 0
+        self.frames = 0
+        self._current = dict.fromkeys(self.phases, 0.0)
+        self._frame_start = time.perf_counter()
+        self._last = self._frame_start
+
+    def begin_frame(self):
+        self._frame_start = self._last = time.perf_counter()
+        for phase in self.phases:
+            self._current[phase] = 0.0
+
+    def lap(self, phase):
+        """Soma à fase o tempo desde a última marca (a fase pode aparecer várias vezes por frame)"""
+        now = time.perf_counter()
+        self._current[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        index = self.index
+        for phase in self.phases:
+            self.samples[phase][index] = self._current[phase]
+        self.totals[index] = self._last - self._frame_start
+        self.index = (index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.frames += 1
+
+    def last(self, phase=None):
+        """Amostra do último frame registrado (phase=None: tempo total do frame)"""
+        if not self.count:
+            return 0.0
+        values = self.totals if phase is None else self.samples[phase]
+        return values[self.index - 1]
+
+    def recent(self, phase=None):
+        """Amostras em ordem cronológica (phase=None: tempo total do frame)"""
+        values = self.totals if phase is None else self.samples[phase]
+        start = (self.index - self.count) % self.capacity
+        return [values[(start + i) % self.capacity] for i in range(self.count)]
+
+    def percentiles(self, phase=None, fractions=(0.5, 0.95, 0.99)):
+        ordered = sorted(self.recent(phase))
+        return [percentile(ordered, fraction) for fraction in fractions]
+
+    def rows(self):
+        """Uma linha por frame: número do frame, total e cada fase, em milissegundos"""
+        first = self.frames - self.count
+        columns = [self.recent()] + [self.recent(phase) for phase in self.phases]
+        for i, values in enumerate(zip(*columns)):
+            yield [first + i] + [round(value * 1000, 4) for value in values]
+
+    def dump(self, path):
+        """Exporta o buffer para CSV ou JSON (pela extensão do arquivo)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        header = ['frame', 'total'] + self.phases
+        if path.endswith('.json'):
+            summary = {}
+            for phase in [None] + self.phases:
+                p50, p95, p99 = self.percentiles(phase)
+                summary[phase or 'total'] = {'p50': p50 * 1000, 'p95': p95 * 1000, 'p99': p99 * 1000}
+            data = {
+                'unit': 'ms',
+                'summary': summary,
+                'frames': [dict(zip(header, row)) for row in self.rows()]
+            }
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+        else:
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(self.rows())
+
+class ProfilerOverlay:
+    """Gráfico do tempo de frame e percentis por fase, desenhado sobre o jogo"""
+    GRAPH_WIDTH = 240
+    GRAPH_HEIGHT = 60
+    GRAPH_MAX = 1 / 20  # Topo do gráfico: 50 ms
+    REFRESH_FRAMES = 15  # Os textos são refeitos só de tempos em tempos
+    BACKGROUND = (0, 0, 0, 170)
+    GRAPH_COLOR = (80, 220, 80)
+    SLOW_COLOR = (240, 80, 80)
+    TARGET_COLOR = (255, 255, 0)
+    TEXT_COLOR = (255, 255, 255)
+
+    def __init__(self, profiler, font, target_fps=60):
+        self.profiler = profiler
+        self.font = font
+        self.target = 1 / target_fps
+        self._panel = None
+        self._text = None
+        self._refreshed_at = None
+
+    def _render_text(self):
+        lines = []
+        p50, p95, p99 = self.profiler.percentiles()
+        lines.append(f"frame p50 {p50 * 1000:.1f} | p95 {p95 * 1000:.1f} | p99 {p99 * 1000:.1f} ms")
+        lines.append("fase: p50 / p95 / p99 (ms)")
+        for phase in self.profiler.phases:
+            p50, p95, p99 = self.profiler.percentiles(phase)
+            lines.append(f"{phase}: {p50 * 1000:.2f} / {p95 * 1000:.2f} / {p99 * 1000:.2f}")
+        rendered = [self.font.render(line, True, self.TEXT_COLOR) for line in lines]
+        width = max(surface.get_width() for surface in rendered)
+        height = sum(surface.get_height() for surface in rendered)
+        text = pygame.Surface((width, height), pygame.SRCALPHA)
+        y = 0
+        for surface in rendered:
+            text.blit(surface, (0, y))
+            y += surface.get_height()
+        return text
+
+    def _compose(self):
+        if self._text is None or self.profiler.frames - self._refreshed_at >= self.REFRESH_FRAMES:
+            self._text = self._render_text()
+            self._refreshed_at = self.profiler.frames
+        width = max(self.GRAPH_WIDTH, self._text.get_width()) + 10
+        height = self.GRAPH_HEIGHT + self._text.get_height() + 15
+        if self._panel is None or self._panel.get_size() != (width, height):
+            self._panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel = self._panel
+        panel.fill(self.BACKGROUND)
+
+        # Uma barra por frame, da mais antiga (esquerda) para a mais recente
+        totals = self.profiler.recent()[-self.GRAPH_WIDTH:]
+        bottom = 5 + self.GRAPH_HEIGHT
+        scale = self.GRAPH_HEIGHT / self.GRAPH_MAX
+        for i, total in enumerate(totals):
+            bar = min(int(total * scale), self.GRAPH_HEIGHT)
+            color = self.SLOW_COLOR if total > self.target * 1.5 else self.GRAPH_COLOR
+            pygame.draw.line(panel, color, (5 + i, bottom), (5 + i, bottom - bar))
+        target_y = bottom - int(self.target * scale)
+        pygame.draw.line(panel, self.TARGET_COLOR, (5, target_y), (5 + self.GRAPH_WIDTH, target_y))
+
+        panel.blit(self._text, (5, bottom + 5))
+        return panel
+
+    def draw(self, surface, pos=(None, 10)):
+        """Desenha o overlay (por padrão no canto superior direito) e retorna a área ocupada"""
+        panel = self._compose()
+        x, y = pos
+        if x is None:
+            x = surface.get_width() - panel.get_width() - 10
+        return surface.blit(panel, (x, y))
+
+class StartupProfiler:
+    """Marcos da inicialização, do início da importação até o primeiro quadro apresentado"""
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.marks = []  # (fase, instante em que terminou), em ordem
+
+    def mark(self, phase, at=None):
+        self.marks.append((phase, time.perf_counter() if at is None else at))
+
+    def report(self):
+        """Mostra quanto cada fase levou e o total"""
+        if not self.marks:
+            return
+        print(f"Inicialização em {(self.marks[-1][1] - self.start) * 1000:.1f} ms:")
+        previous = self.start
+        for phase, at in self.marks:
+            print(f"  {phase}: {(at - previous) * 1000:.1f} ms (em {(at - self.start) * 1000:.1f} ms)")
+            previous = at
@@ -0,0 +1,110 @@
+"""
+Qualidade adaptativa - reduz o custo visual quando o orçamento de 60 FPS estoura
+
+O governador recebe o tempo de trabalho de cada frame (o frame inteiro menos a
+espera do clock) e, quando a mediana dos últimos frames passa perto do
+orçamento, desliga o próximo estágio de QUALITY_STAGES. Os estágios são
+cumulativos: no nível 2, por exemplo, a rotação e os extras do HUD estão
+desligados. Com folga de sobra por mais tempo, a qualidade volta um estágio.
+
+Histerese contra oscilação:
+- reduzir olha uma janela curta e um limite alto; restaurar olha uma janela
+  longa e um limite bem mais baixo;
+- depois de cada mudança as amostras são descartadas, e só os frames do novo
+  nível contam;
+- se a qualidade precisar ser reduzida logo depois de restaurada, a janela
+  de restauração dobra (até um máximo): o jogo tenta subir cada vez menos vezes.
+"""
+from collections import deque
+from itertools import islice
+
+# Estágios desligados em ordem, do mais barato de perder ao mais visível
+QUALITY_STAGES = ['rotation', 'hud_extras', 'obstacle_sprites', 'full_resolution']
+STAGE_NAMES = {
+    'rotation': "rotação do jogador",
+    'hud_extras': "extras do HUD",
+    'obstacle_sprites': "sprites dos obstáculos",
+    'full_resolution': "resolução cheia"
+}
+LOW_RENDER_SCALE = 0.5  # Resolução interna usada sem o estágio full_resolution
+
+DEGRADE_LOAD = 0.9  # Reduzir com a mediana acima de 90% do orçamento...
+DEGRADE_WINDOW = 30  # ...nos últimos 30 frames (meio segundo)
+RESTORE_LOAD = 0.5  # Restaurar com a mediana abaixo de 50% do orçamento...
+RESTORE_WINDOW = 120  # ...nos últimos 120 frames (dois segundos), no mínimo
+MAX_RESTORE_WINDOW = 3600  # Limite do recuo após oscilações (~1 minuto)
+RESTORE_PROBATION = 300  # Reduzir antes disso após restaurar conta como oscilação
+
+class QualityGovernor:
+    """Nível de qualidade (0 = tudo ligado) ajustado pelo tempo de trabalho dos frames"""
+    def __init__(self, budget, stages=QUALITY_STAGES, degrade_load=DEGRADE_LOAD, degrade_window=DEGRADE_WINDOW,
+                 restore_load=RESTORE_LOAD, restore_window=RESTORE_WINDOW):
+        self.budget = budget  # Segundos por frame (1/60)
+        self.stages = list(stages)
+        self.degrade_load = degrade_load
+        self.degrade_window = degrade_window
+        self.restore_load = restore_load
+        self.restore_window = restore_window
+        self.level = 0
+        self.changes = 0
+        self._frames_since_restore = None  # Frames desde a última restauração (None: nenhuma recente)
+        self.reset()
+
+    def allows(self, stage):
+        """Se o estágio ainda está ligado no nível atual"""
+        return self.level <= self.stages.index(stage)
+
+    def reset(self):
+        """Descarta as amostras (troca de tela, recomeço de partida, mudança de nível)"""
+        # Guarda só a janela mais longa; a de restauração muda apenas antes de um reset
+        self.samples = deque(maxlen=max(self.restore_window, self.degrade_window))
+        self._fast = 0  # Amostras guardadas abaixo do limite de restauração
+
+    def _median(self, count):
+        """Mediana das últimas `count` amostras (só a janela curta é ordenada)"""
+        recent = sorted(islice(reversed(self.samples), count))
+        return recent[len(recent) // 2]
+
+    def _mostly_fast(self):
+        """Se a mediana da janela de restauração está abaixo do limite, sem ordenar a janela
+
+        A mediana (recent[n // 2] da janela ordenada) fica abaixo do limite
+        quando mais da metade das amostras fica: basta a contagem mantida em update().
+        """
+        window = len(self.samples)
+        return window >= self.restore_window and self._fast > window // 2
+
+    def update(self, work):
+        """Registra o tempo de trabalho de um frame; retorna True se o nível mudou"""
+        samples = self.samples
+        fast = self.budget * self.restore_load
+        if len(samples) == samples.maxlen and samples[0] < fast:
+            self._fast -= 1  # A amostra mais antiga sai da janela
+        samples.append(work)
+        if work < fast:
+            self._fast += 1
+        if self._frames_since_restore is not None:
+            self._frames_since_restore += 1
+            if self._frames_since_restore > RESTORE_PROBATION:
+                self._frames_since_restore = None
+
+        if (self.level < len(self.stages) and len(self.samples) >= self.degrade_window and
+                self._median(self.degrade_window) > self.budget * self.degrade_load):
+            if self._frames_since_restore is not None:
+                # Subiu e não aguentou: esperar mais antes de tentar de novo
+                self.restore_window = min(self.restore_window * 2, MAX_RESTORE_WINDOW)
+                self._frames_since_restore = None
+            self.level += 1
+            self.changes += 1
+            self.reset()
+            print(f"Qualidade reduzida (nível {self.level}): sem {STAGE_NAMES[self.stages[self.level - 1]]}")
+            return True
+
+        if self.level > 0 and self._mostly_fast():
+            self.level -= 1
+            self.changes += 1
+            self._frames_since_restore = 0
+            self.reset()
+            print(f"Qualidade restaurada (nível {self.level}): com {STAGE_NAMES[self.stages[self.level]]}")
+            return True
+        return False
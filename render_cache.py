@@ -0,0 +1,186 @@
+"""
+Caches de renderização - superfícies reaproveitadas entre frames
+"""
+import pygame
+from collections import OrderedDict
+
+# Passo padrão (em graus) dos ângulos pré-rotacionados
+ROTATION_STEP = 5
+# Memória máxima ocupada pelas rotações guardadas
+ROTATION_MEMORY_BUDGET = 16 * 1024 * 1024
+# Largura máxima do atlas de sprites, e alinhamento (em pixels) de cada sprite dentro dele
+ATLAS_MAX_WIDTH = 256
+ATLAS_ALIGNMENT = 16
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+class RotationCache:
+    """Sprites rotacionados em ângulos quantizados, para desenhar sem transform por frame
+
+    Na primeira rotação pedida de um sprite, todos os ângulos múltiplos de
+    `angle_step` são gerados de uma vez (se couberem no orçamento de memória).
+    Depois disso cada frame é só uma consulta ao dicionário.
+    """
+    def __init__(self, angle_step=ROTATION_STEP, smooth=False, memory_budget=ROTATION_MEMORY_BUDGET):
+        self.angle_step = angle_step
+        self.smooth = smooth  # rotozoom suaviza as bordas, mas é mais lento para gerar
+        self.memory_budget = memory_budget
+        self.memory_used = 0
+        self._sources = {}  # chave -> sprite original usado para gerar as rotações
+        self._rotations = OrderedDict()  # (chave, ângulo) -> superfície, em ordem de uso
+
+    def quantize(self, angle):
+        """Ângulo múltiplo de angle_step mais próximo, entre 0 e 359"""
+        return int(round(angle / self.angle_step) * self.angle_step) % 360
+
+    def _rotate(self, sprite, angle):
+        if self.smooth:
+            return pygame.transform.rotozoom(sprite, angle, 1)
+        return pygame.transform.rotate(sprite, angle)
+
+    def _store(self, key, angle, rotated):
+        self._rotations[(key, angle)] = rotated
+        self.memory_used += surface_bytes(rotated)
+        # Descartar as rotações usadas há mais tempo quando o orçamento estoura
+        while self.memory_used > self.memory_budget and len(self._rotations) > 1:
+            _, old = self._rotations.popitem(last=False)
+            self.memory_used -= surface_bytes(old)
+
+    def clear(self, key=None):
+        for cached_key, angle in list(self._rotations):
+            if key is None or cached_key == key:
+                self.memory_used -= surface_bytes(self._rotations.pop((cached_key, angle)))
+        if key is None:
+            self._sources.clear()
+        else:
+            self._sources.pop(key, None)
+
+    def is_prebaked(self, key, sprite):
+        """Se as rotações guardadas para a chave foram geradas a partir deste sprite"""
+        return self._sources.get(key) is sprite
+
+    def prebake(self, key, sprite):
+        """Gera todas as rotações de um sprite que couberem no orçamento"""
+        self.clear(key)
+        self._sources[key] = sprite
+        per_angle = surface_bytes(self._rotate(sprite, 45))  # Maior caixa possível
+        free = self.memory_budget - self.memory_used
+        if per_angle * (360 // self.angle_step) > free:
+            return  # Não cabe: as rotações serão geradas sob demanda
+        for angle in range(0, 360, self.angle_step):
+            self._store(key, angle, sprite if angle == 0 else self._rotate(sprite, angle))
+
+    def get(self, key, sprite, angle):
+        """Sprite rotacionado no ângulo quantizado mais próximo"""
+        if not self.is_prebaked(key, sprite):
+            # Sprite novo (ou recarregado): gerar as rotações de novo
+            self.prebake(key, sprite)
+        angle = self.quantize(angle)
+        if angle == 0:
+            return sprite
+        rotated = self._rotations.get((key, angle))
+        if rotated is None:
+            rotated = self._rotate(sprite, angle)
+            self._store(key, angle, rotated)
+        else:
+            self._rotations.move_to_end((key, angle))
+        return rotated
+
+class TextLabel:
+    """Texto renderizado de novo só quando o conteúdo ou a cor mudam"""
+    def __init__(self, font, color=(0, 0, 0), antialias=True):
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self._key = None
+        self._surface = None
+
+    def render(self, text, color=None):
+        color = self.color if color is None else color
+        if (text, color) != self._key:
+            self._surface = self.font.render(text, self.antialias, color)
+            self._key = (text, color)
+        return self._surface
+
+class GlyphAtlas:
+    """Glifos pré-renderizados para compor números sem chamar font.render por frame"""
+    def __init__(self, font, color=(0, 0, 0), chars='0123456789.-', antialias=True):
+        self.glyphs = {char: font.render(char, antialias, color) for char in chars}
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+
+    def width(self, text):
+        return sum(self.glyphs[char].get_width() for char in text)
+
+    def draw(self, surface, text, pos):
+        """Desenha o texto glifo a glifo e retorna a área ocupada"""
+        x, y = pos
+        start_x = x
+        glyphs = self.glyphs
+        for char in text:
+            glyph = glyphs[char]
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+        return pygame.Rect(start_x, y, x - start_x, self.height)
+
+class SpriteAtlas:
+    """Vários sprites copiados para uma única superfície, cada um com seu retângulo de origem
+
+    Com todos os sprites na mesma superfície, o jogo monta a lista de desenho
+    do frame como tuplas (atlas, destino, área) e envia tudo num único
+    Surface.blits, em vez de um blit (e uma busca de sprite) por entidade.
+    Os sprites são empilhados em prateleiras, dos mais altos para os mais baixos.
+
+    Cada sprite começa numa coluna múltipla de `alignment` e a largura do atlas
+    também é arredondada: com linhas desalinhadas na memória (larguras ímpares),
+    o blit a partir do atlas chega a sair mais lento que o de sprites separados.
+    """
+    def __init__(self, sprites, max_width=ATLAS_MAX_WIDTH, alignment=ATLAS_ALIGNMENT, image=None):
+        """sprites: dicionário chave -> superfície (com transparência)
+
+        image: atlas já montado com estes sprites e parâmetros (por exemplo o do
+        pacote de assets, mapeado em memória); é usado direto, sem cópia.
+        """
+        placements, size = self.layout({key: sprite.get_size() for key, sprite in sprites.items()},
+                                       max_width, alignment)
+        if image is not None and image.get_size() == size:
+            self.image = image
+        else:
+            self.image = self.compose(sprites, placements, size)
+        self.regions = placements
+
+    @staticmethod
+    def layout(sizes, max_width=ATLAS_MAX_WIDTH, alignment=ATLAS_ALIGNMENT):
+        """Retângulo de cada chave no atlas e o tamanho do atlas, a partir dos tamanhos dos sprites"""
+        placements = {}
+        x = y = shelf_height = width = 0
+        for key, (sprite_width, sprite_height) in sorted(sizes.items(), key=lambda item: -item[1][1]):
+            if x and x + sprite_width > max_width:
+                # Prateleira cheia: começar outra abaixo
+                x = 0
+                y += shelf_height
+                shelf_height = 0
+            placements[key] = pygame.Rect(x, y, sprite_width, sprite_height)
+            x = -(-(x + sprite_width) // alignment) * alignment
+            width = max(width, x)
+            shelf_height = max(shelf_height, sprite_height)
+        return placements, (max(width, alignment), max(y + shelf_height, 1))
+
+    @staticmethod
+    def compose(sprites, placements, size):
+        """Superfície do atlas com cada sprite copiado para o seu retângulo"""
+        image = pygame.Surface(size, pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        image.fill((0, 0, 0, 0))
+        for key, rect in placements.items():
+            # Somar sobre o fundo zerado copia os pixels sem misturar o alpha
+            image.blit(sprites[key], rect, special_flags=pygame.BLEND_RGBA_ADD)
+        return image
+
+    def __contains__(self, key):
+        return key in self.regions
+
+    def draw_item(self, key, pos):
+        """Tupla (superfície, destino, área) para Surface.blits"""
+        return self.image, pos, self.regions[key]
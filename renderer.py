@@ -0,0 +1,99 @@
+"""
+Renderização do cenário - camadas com rolagem e retângulos sujos
+
+ScrollingLayer desenha uma faixa do cenário rolando com a partida (chão e
+fundo em velocidades diferentes, para o efeito de paralaxe). DirtyRectRenderer
+apresenta só as áreas da tela que mudaram, sobre um fundo estático.
+"""
+import pygame
+
+# Acima desta fração da tela suja, um flip completo sai mais barato
+MAX_DIRTY_FRACTION = 0.4
+
+class ScrollingLayer:
+    """Faixa horizontal do cenário que rola continuamente, dando a volta na largura
+
+    A imagem é pré-montada uma vez numa faixa com o dobro da largura: a
+    original seguida do seu espelho, que emenda sem costura nas duas bordas.
+    A cada frame a faixa é desenhada com no máximo dois blits de sub-retângulos
+    (o trecho até o fim da faixa e o começo dela), sem criar superfícies.
+    """
+    def __init__(self, image, y, speed_factor, area=None):
+        """image: superfície de origem; area: parte dela usada (padrão: inteira)
+
+        y é a posição na tela e speed_factor a fração da velocidade da partida
+        com que a camada rola (1 = junto com os obstáculos).
+        """
+        if area is not None:
+            image = image.subsurface(area)
+        width, height = image.get_size()
+        self.strip = pygame.Surface((width * 2, height), 0, image)
+        self.strip.blit(image, (0, 0))
+        self.strip.blit(pygame.transform.flip(image, True, False), (width, 0))
+        self.width = width
+        self.period = width * 2
+        self.y = y
+        self.speed_factor = speed_factor
+
+    def draw(self, surface, distance):
+        """Desenha a camada depois de a partida ter percorrido `distance` pixels"""
+        offset = int(distance * self.speed_factor) % self.period
+        first = min(self.period - offset, self.width)
+        surface.blit(self.strip, (0, self.y), (offset, 0, first, self.strip.get_height()))
+        if first < self.width:
+            # Passou do fim da faixa: o resto vem do começo dela
+            surface.blit(self.strip, (first, self.y), (0, 0, self.width - first, self.strip.get_height()))
+        return pygame.Rect(0, self.y, self.width, self.strip.get_height())
+
+class DirtyRectRenderer:
+    """Restaura o fundo estático só onde algo foi desenhado e atualiza só essas áreas
+
+    A cada frame, as áreas ocupadas no frame anterior são restauradas a partir
+    do fundo estático (background + chão). Em seguida o jogo desenha os sprites
+    e o HUD, e a tela é atualizada com pygame.display.update(rects) cobrindo as
+    áreas antigas e novas.
+    """
+    def __init__(self, screen, max_dirty_fraction=MAX_DIRTY_FRACTION):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.max_dirty_fraction = max_dirty_fraction
+        self.static_background = None
+        self.previous_rects = []
+        self.full_redraw = True
+        self.full_flips = 0
+        self.partial_updates = 0
+
+    def set_background(self, surface):
+        """Define o fundo estático (mesmo tamanho da tela)"""
+        if surface is not self.static_background:
+            self.static_background = surface
+            self.invalidate()
+
+    def invalidate(self):
+        """Força o próximo frame a redesenhar e apresentar a tela inteira"""
+        self.full_redraw = True
+
+    def begin_frame(self):
+        """Apaga o que foi desenhado no frame anterior"""
+        if self.full_redraw:
+            self.screen.blit(self.static_background, (0, 0))
+        else:
+            for rect in self.previous_rects:
+                self.screen.blit(self.static_background, rect, rect)
+
+    def end_frame(self, rects):
+        """Apresenta o frame; rects são as áreas desenhadas neste frame"""
+        rects = [self.screen_rect.clip(rect) for rect in rects if rect]
+        rects = [rect for rect in rects if rect.width and rect.height]
+        dirty = self.previous_rects + rects
+        dirty_area = sum(rect.width * rect.height for rect in dirty)
+        screen_area = self.screen_rect.width * self.screen_rect.height
+
+        if self.full_redraw or dirty_area > screen_area * self.max_dirty_fraction:
+            pygame.display.flip()
+            self.full_flips += 1
+        else:
+            pygame.display.update(dirty)
+            self.partial_updates += 1
+        self.previous_rects = rects
+        self.full_redraw = False
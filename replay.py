@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Replays - gravação compacta das entradas de uma partida e reprodução sem janela
+
+Formato do arquivo (little-endian):
+    cabeçalho: 'SKRP', versão, semente, spawn_rate, min_spawn_rate, max_speed,
+               total de ticks, pontuação final
+    corpo: sequência de (máscara de teclas: 1 byte, repetições: varint)
+
+A máscara usa os bits de InputFrame (LEFT/RIGHT/DOWN/UP/SPACE). Como as teclas
+mudam poucas vezes por segundo, um minuto de jogo ocupa poucos KB.
+"""
+import copy
+import struct
+import sys
+import time
+
+from simulation import Simulation, InputFrame, FPS
+
+MAGIC = b'SKRP'
+VERSION = 2  # 2: obstáculos rolam com a pista; o arredondamento das posições mudou
+HEADER = struct.Struct('<4sBQHHdII')
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+class Replay:
+    """Semente, dificuldade e entradas (codificadas por repetição) de uma partida"""
+    def __init__(self, seed, runs, spawn_rate=90, min_spawn_rate=60, max_speed=12, final_score=0):
+        self.seed = seed
+        self.runs = runs  # Lista de [máscara, repetições]
+        self.spawn_rate = spawn_rate
+        self.min_spawn_rate = min_spawn_rate
+        self.max_speed = max_speed
+        self.final_score = final_score
+
+    @property
+    def ticks(self):
+        return sum(length for _, length in self.runs)
+
+    def difficulty(self):
+        return {
+            'spawn_rate': self.spawn_rate,
+            'min_spawn_rate': self.min_spawn_rate,
+            'max_speed': self.max_speed
+        }
+
+    def masks(self):
+        """Entradas expandidas: um byte por tick, para acesso direto em seek()"""
+        masks = bytearray()
+        for mask, length in self.runs:
+            masks.extend(bytes([mask]) * length)
+        return masks
+
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.seed, self.spawn_rate, self.min_spawn_rate,
+                                    self.max_speed, self.ticks, self.final_score))
+        for mask, length in self.runs:
+            out.append(mask)
+            _write_varint(out, length)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("Arquivo de replay incompleto")
+        magic, version, seed, spawn_rate, min_spawn_rate, max_speed, ticks, final_score = \
+            HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Arquivo não é um replay")
+        if version != VERSION:
+            raise ValueError(f"Versão de replay não suportada: {version}")
+        runs = []
+        pos = HEADER.size
+        while pos < len(data):
+            mask = data[pos]
+            length, pos = _read_varint(data, pos + 1)
+            runs.append([mask, length])
+        replay = cls(seed, runs, spawn_rate, min_spawn_rate, max_speed, final_score)
+        if replay.ticks != ticks:
+            raise ValueError("Replay corrompido: número de ticks não confere")
+        return replay
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+class ReplayRecorder:
+    """Grava a entrada de cada tick, juntando ticks repetidos durante a gravação"""
+    def __init__(self, simulation):
+        self.seed = simulation.seed
+        self.difficulty = {
+            'spawn_rate': simulation.spawn_rate,
+            'min_spawn_rate': simulation.min_spawn_rate,
+            'max_speed': simulation.max_speed
+        }
+        self.runs = []
+
+    def record(self, frame):
+        if self.runs and self.runs[-1][0] == frame.mask:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([frame.mask, 1])
+
+    def to_replay(self, final_score):
+        return Replay(self.seed, [list(run) for run in self.runs], final_score=final_score, **self.difficulty)
+
+class ReplayPlayer:
+    """Reproduz um replay na velocidade máxima, com avanço rápido e busca"""
+    def __init__(self, replay, asset_manager=None, keyframe_interval=FPS * 10):
+        self.replay = replay
+        self.asset_manager = asset_manager
+        self.masks = replay.masks()
+        self.keyframe_interval = keyframe_interval
+        self.keyframes = {}  # tick -> cópia da simulação, para buscar para trás sem recomeçar
+        self.simulation = Simulation(asset_manager, seed=replay.seed, **replay.difficulty())
+        self._save_keyframe()
+
+    @property
+    def tick(self):
+        return self.simulation.ticks
+
+    @property
+    def finished(self):
+        return self.tick >= len(self.masks) or self.simulation.game_over
+
+    def _copy(self, simulation):
+        # O gerenciador de assets (superfícies pygame) é compartilhado, não copiado
+        return copy.deepcopy(simulation, {id(self.asset_manager): self.asset_manager})
+
+    def _save_keyframe(self):
+        if self.tick % self.keyframe_interval == 0 and self.tick not in self.keyframes:
+            self.keyframes[self.tick] = self._copy(self.simulation)
+
+    def step(self, ticks=1):
+        """Avança até `ticks` ticks; retorna quantos foram simulados"""
+        simulation = self.simulation
+        masks = self.masks
+        frame = InputFrame()
+        done = 0
+        while done < ticks and not self.finished:
+            frame.mask = masks[simulation.ticks]
+            simulation.step(frame)
+            done += 1
+            self._save_keyframe()
+        return done
+
+    def seek(self, tick):
+        """Vai para o tick pedido, partindo do quadro-chave anterior mais próximo"""
+        tick = max(0, min(tick, len(self.masks)))
+        if tick < self.tick:
+            start = max(t for t in self.keyframes if t <= tick)
+            self.simulation = self._copy(self.keyframes[start])
+        self.step(tick - self.tick)
+
+    def run_to_end(self):
+        self.step(len(self.masks))
+        return self.simulation
+
+def main(argv=None):
+    # Uso: python replay.py arquivo.skr
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Uso: python replay.py arquivo.skr")
+        return 1
+    replay = Replay.load(argv[0])
+    player = ReplayPlayer(replay)
+    start = time.perf_counter()
+    simulation = player.run_to_end()
+    elapsed = time.perf_counter() - start
+
+    real_time = simulation.ticks / FPS
+    print(f"Replay: {argv[0]} ({len(replay.to_bytes())} bytes, {real_time:.1f}s de jogo)")
+    print(f"Pontuação: {simulation.score} (gravada: {replay.final_score})")
+    if elapsed > 0:
+        print(f"Reproduzido em {elapsed:.3f}s ({real_time / elapsed:.0f}x o tempo real)")
+    if simulation.score != replay.final_score:
+        print("AVISO: a pontuação reproduzida difere da gravada")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
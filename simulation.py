@@ -0,0 +1,794 @@
+"""
+Simulação do jogo sem janela - jogador, obstáculos, pontuação e velocidade
+"""
+import bisect
+import pygame
+import random
+import sys
+import time
+from collections import namedtuple
+
+# Constantes
+SCREEN_WIDTH = 1000
+SCREEN_HEIGHT = 600
+FPS = 60  # Ticks de física por segundo: velocidades e durações são por tick
+GRAVITY = 0.8
+GROUND_HEIGHT = SCREEN_HEIGHT - 100
+
+# Cores
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+BLUE = (100, 150, 255)
+GREEN = (50, 200, 50)
+RED = (255, 50, 50)
+ORANGE = (255, 165, 0)
+GRAY = (128, 128, 128)
+DARK_GRAY = (64, 64, 64)
+YELLOW = (255, 255, 0)
+
+# Duração (em frames) e pontuação base de cada manobra
+TRICK_DURATIONS = {
+    'ollie': 20,
+    'kickflip': 30,
+    'heelflip': 30,
+    'spin360': 40,
+    'grind': 60
+}
+TRICK_BONUSES = {
+    'ollie': 10,
+    'kickflip': 30,
+    'heelflip': 30,
+    'spin360': 50,
+    'grind': 40
+}
+
+# Geometria, cor do desenho alternativo e sprite de cada tipo de obstáculo
+ObstacleType = namedtuple('ObstacleType', ['width', 'height', 'y', 'color', 'grindable', 'sprite'])
+OBSTACLE_TYPES = {
+    'barrier': ObstacleType(30, 60, GROUND_HEIGHT - 60, RED, True, 'barrier'),
+    'low_barrier': ObstacleType(30, 30, GROUND_HEIGHT - 30, ORANGE, True, 'low_barrier'),
+    'ramp': ObstacleType(60, 50, GROUND_HEIGHT - 50, GREEN, False, 'ramp'),  # Rampas muito mais altas
+    'rail': ObstacleType(40, 10, GROUND_HEIGHT - 10 - 20, GRAY, True, 'rail')  # Suspenso 20px acima do chão
+}
+
+# Tipos sorteados ao gerar obstáculos (maior chance de rampas)
+SPAWN_CHOICES = ['barrier', 'barrier', 'low_barrier', 'ramp', 'ramp', 'rail']
+
+class Player:
+    def __init__(self, x, y, asset_manager):
+        self.x = x
+        self.y = y
+        self.prev_y = y  # Posição no tick anterior, para interpolar o desenho
+        self.width = 60
+        self.height = 80
+        self.vel_y = 0
+        self.jump_power = -15
+        self.on_ground = False
+        self.animation_frame = 0
+        self.animation_speed = 0.2
+        self.asset_manager = asset_manager
+        
+        # Sistema de manobras
+        self.current_trick = None
+        self.trick_progress = 0
+        self.trick_duration = 0
+        self.rotation = 0  # Para rotações de 360 graus
+        self.board_flip = 0  # Para kickflip/heelflip
+        self.trick_completed = False
+        self.trick_bonus = 0
+        self.queued_trick = None  # Manobra na fila para começar ao pular
+        self.last_key_state = {}  # Rastrear estados anteriores das teclas para detectar pressionamentos
+        self.on_ramp = False  # Rastrear se o jogador está na rampa
+        self.ramp_boost = False  # Rastrear se o jogador recebeu boost da rampa
+        
+    def update(self, keys, obstacles):
+        self.prev_y = self.y
+        # Detectar transição de não pressionado para pressionado
+        key_pressed = {}
+        key_pressed[pygame.K_LEFT] = keys[pygame.K_LEFT] and not self.last_key_state.get(pygame.K_LEFT, False)
+        key_pressed[pygame.K_RIGHT] = keys[pygame.K_RIGHT] and not self.last_key_state.get(pygame.K_RIGHT, False)
+        key_pressed[pygame.K_DOWN] = keys[pygame.K_DOWN] and not self.last_key_state.get(pygame.K_DOWN, False)
+        key_pressed[pygame.K_UP] = keys[pygame.K_UP] and not self.last_key_state.get(pygame.K_UP, False)
+        key_pressed[pygame.K_SPACE] = keys[pygame.K_SPACE] and not self.last_key_state.get(pygame.K_SPACE, False)
+        
+        # Atualizar estados anteriores das teclas
+        self.last_key_state[pygame.K_LEFT] = keys[pygame.K_LEFT]
+        self.last_key_state[pygame.K_RIGHT] = keys[pygame.K_RIGHT]
+        self.last_key_state[pygame.K_DOWN] = keys[pygame.K_DOWN]
+        self.last_key_state[pygame.K_UP] = keys[pygame.K_UP]
+        self.last_key_state[pygame.K_SPACE] = keys[pygame.K_SPACE]
+        
+        # Lidar com entradas de manobras quando no ar (permite se a tecla for pressionada OU mantida)
+        if not self.on_ground:
+            if self.current_trick is None:
+                # Começar nova manobra - verificar se a tecla foi pressionada ou mantida
+                if keys[pygame.K_LEFT]:
+                    self.start_trick('kickflip')
+                elif keys[pygame.K_RIGHT]:
+                    self.start_trick('heelflip')
+                elif keys[pygame.K_DOWN]:
+                    self.start_trick('spin360')
+            # Também permite que manobras sejam iniciadas mesmo se já estiver fazendo uma (para combos)
+            elif self.current_trick == 'ollie' and self.trick_progress < 15:
+                # Pode transicionar de ollie para outras manobras cedo
+                if keys[pygame.K_LEFT]:
+                    self.start_trick('kickflip')
+                elif keys[pygame.K_RIGHT]:
+                    self.start_trick('heelflip')
+                elif keys[pygame.K_DOWN]:
+                    self.start_trick('spin360')
+        else:
+            # No chão - colocar manobras na fila
+            if key_pressed[pygame.K_LEFT]:
+                self.queued_trick = 'kickflip'
+            elif key_pressed[pygame.K_RIGHT]:
+                self.queued_trick = 'heelflip'
+            elif key_pressed[pygame.K_DOWN]:
+                self.queued_trick = 'spin360'
+        
+        # Pulo regular (Ollie)
+        if keys[pygame.K_SPACE] or keys[pygame.K_UP]:
+            if self.on_ground:
+                self.vel_y = self.jump_power
+                self.on_ground = False
+                # Começar ollie ou manobra na fila
+                if self.queued_trick:
+                    self.start_trick(self.queued_trick)
+                    self.queued_trick = None
+                else:
+                    self.start_trick('ollie')
+        
+        # Atualizar manobra atual
+        if self.current_trick:
+            self.trick_progress += 1
+            self.update_trick_animation()
+            
+            # Verificar se a manobra está completa
+            if self.trick_progress >= self.trick_duration:
+                if not self.trick_completed:
+                    self.trick_completed = True
+                    self.trick_bonus = self.get_trick_bonus()
+                # Resetar manobra ao pousar
+                if self.on_ground:
+                    bonus = self.trick_bonus
+                    self.reset_trick()
+                    return bonus
+        
+        # Aplicar gravidade
+        self.vel_y += GRAVITY
+        
+        # Atualizar posição
+        self.y += self.vel_y
+        
+        # Obstáculos na faixa do jogador (os mesmos para o grind e a rampa)
+        obstacles = nearby(obstacles, self.x, self.x + self.width)
+
+        # Verificar grind (em rails/barreiras)
+        self.check_grind(obstacles)
+        
+        # Verificar interação com rampa
+        self.check_ramp(obstacles)
+        
+        # Colisão com o chão
+        ground_y = GROUND_HEIGHT - self.height
+        if self.y >= ground_y:
+            self.y = ground_y
+            self.vel_y = 0
+            self.on_ground = True
+            self.on_ramp = False
+            if self.current_trick and self.trick_completed:
+                bonus = self.trick_bonus
+                self.reset_trick()
+                return bonus
+            elif self.current_trick:
+                self.reset_trick()  # Manobra falhou
+        
+        # Atualizar animação
+        self.animation_frame += self.animation_speed
+        if self.animation_frame >= 4:
+            self.animation_frame = 0
+        
+        return 0
+    
+    def start_trick(self, trick_name):
+        self.current_trick = trick_name
+        self.trick_progress = 0
+        self.trick_completed = False
+        self.trick_bonus = 0
+        
+        if trick_name in TRICK_DURATIONS:
+            self.trick_duration = TRICK_DURATIONS[trick_name]
+    
+    def update_trick_animation(self):
+        if self.current_trick == 'spin360':
+            self.rotation = (self.trick_progress / self.trick_duration) * 360
+        elif self.current_trick == 'kickflip':
+            self.board_flip = (self.trick_progress / self.trick_duration) * 360
+        elif self.current_trick == 'heelflip':
+            self.board_flip = -(self.trick_progress / self.trick_duration) * 360
+        elif self.current_trick == 'ollie':
+            # Ollie apenas tem pulo mais alto, sem animação especial
+            pass
+    
+    def get_trick_bonus(self):
+        if not self.trick_completed:
+            return 0
+        # Pontuações base para cada manobra
+        base_bonus = TRICK_BONUSES.get(self.current_trick, 0)
+        
+        # Multiplicador de bônus se a manobra foi feita na/de uma rampa
+        if self.ramp_boost:
+            base_bonus = int(base_bonus * 1.5)  # 50% de bônus para manobras na rampa
+        
+        return base_bonus
+    
+    def reset_trick(self):
+        self.current_trick = None
+        self.trick_progress = 0
+        self.trick_duration = 0
+        self.rotation = 0
+        self.board_flip = 0
+        self.trick_completed = False
+        self.trick_bonus = 0
+        self.queued_trick = None
+        self.ramp_boost = False  # Resetar boost da rampa quando a manobra reseta
+    
+    def check_grind(self, obstacles):
+        # Verificar se o jogador pode fazer grind no topo de barreiras baixas, rails ou barreiras
+        player_bottom = self.y + self.height
+        player_center_x = self.x + self.width // 2
+        
+        # obstacles já vem filtrado por update() (só os da faixa do jogador)
+        for obstacle in obstacles:
+            if obstacle.grindable:
+                obstacle_top = obstacle.y
+                obstacle_left = obstacle.x
+                obstacle_right = obstacle_left + obstacle.width
+                
+                # Verificar se o jogador está acima e alinhado com o obstáculo
+                if (player_bottom >= obstacle_top - 5 and 
+                    player_bottom <= obstacle_top + 10 and
+                    player_center_x >= obstacle_left and 
+                    player_center_x <= obstacle_right and
+                    abs(self.vel_y) < 2):
+                    # Começar grind
+                    if self.current_trick != 'grind':
+                        self.start_trick('grind')
+                    self.y = obstacle_top - self.height
+                    self.vel_y = 0
+                    self.on_ground = False
+                    return
+    
+    def check_ramp(self, obstacles):
+        # Verificar se o jogador está na ou passando por uma rampa
+        player_bottom = self.y + self.height
+        player_center_x = self.x + self.width // 2
+        player_left = self.x
+        player_right = self.x + self.width
+        
+        was_on_ramp = self.on_ramp
+        self.on_ramp = False
+        
+        for obstacle in obstacles:
+            if obstacle.type == 'ramp':
+                ramp_left = obstacle.x
+                ramp_right = ramp_left + obstacle.width
+                ramp_top = obstacle.y
+                ramp_bottom = obstacle.y + obstacle.height
+                
+                # Verificar se o jogador está colidindo com a rampa
+                if (player_right > ramp_left and player_left < ramp_right and
+                    player_bottom > ramp_top and self.y < ramp_bottom):
+                    
+                    self.on_ramp = True
+                    
+                    # Calcular posição na rampa (0 = esquerda, 1 = direita)
+                    ramp_pos = (player_center_x - ramp_left) / obstacle.width if obstacle.width > 0 else 0.5
+                    ramp_center_x = ramp_left + obstacle.width // 2
+                    
+                    # Dar boost ao subir a rampa (lado esquerdo, aproximando do centro)
+                    if (ramp_pos > 0.2 and ramp_pos < 0.6 and 
+                        not self.ramp_boost and 
+                        player_center_x < ramp_center_x + 10):
+                        # Dar boost vertical
+                        if self.vel_y > -8:  # Apenas dar boost se não estiver já pulando muito alto
+                            self.vel_y = -22  # Boost forte da rampa
+                            self.ramp_boost = True
+                            # Se não estiver fazendo uma manobra, começar ollie automaticamente
+                            if not self.current_trick:
+                                self.start_trick('ollie')
+                    
+                    # Ajustar posição do jogador para estar na superfície da rampa
+                    # A rampa é triangular, então calcular posição Y baseada em X
+                    if player_center_x < ramp_center_x:
+                        # Lado esquerdo da rampa (subindo)
+                        ramp_slope = (ramp_top - ramp_bottom) / (obstacle.width // 2) if obstacle.width > 0 else 0
+                        relative_x = player_center_x - ramp_left
+                        ramp_y = ramp_bottom - (relative_x * ramp_slope)
+                    else:
+                        # Lado direito da rampa (descendo)
+                        ramp_slope = (ramp_bottom - ramp_top) / (obstacle.width // 2) if obstacle.width > 0 else 0
+                        relative_x = player_center_x - ramp_center_x
+                        ramp_y = ramp_top + (relative_x * ramp_slope)
+                    
+                    # Definir posição do jogador na rampa
+                    target_y = ramp_y - self.height
+                    if self.y + self.height > ramp_y:
+                        self.y = target_y
+                        self.on_ground = False
+                        # Diminuir velocidade de descida na rampa, mas permitir movimento para cima
+                        if self.vel_y > 0:
+                            self.vel_y = max(self.vel_y * 0.5, 0.5)
+                    
+                    return
+        
+        # Resetar boost da rampa ao sair dela
+        if was_on_ramp and not self.on_ramp:
+            # Manter flag de boost por um tempo após sair da rampa para permitir conclusão da manobra
+            pass
+    
+    def draw(self, screen, alpha=1.0):
+        # Retorna a área desenhada (usada pelo renderizador de retângulos sujos)
+        # alpha: fração do caminho entre o tick anterior (0) e o atual (1)
+        return screen.blit(*self.draw_item(self.asset_manager.atlas, alpha))
+    
+    def sprite_state(self):
+        """Pose do jogador (ver PLAYER_STATES) para a manobra atual"""
+        if self.current_trick in ('ollie', 'kickflip', 'grind'):
+            return self.current_trick
+        elif self.current_trick:
+            return 'ollie'  # Padrão para ollie em outras manobras
+        return 'idle'
+    
+    def draw_item(self, atlas, alpha=1.0, scale=1.0, rotate=True):
+        """Tupla (superfície, destino, área) do jogador para Surface.blits
+
+        scale converte as coordenadas do jogo para as da superfície de destino
+        (renderização em resolução interna menor; os sprites já vêm nessa escala).
+        rotate=False desenha as manobras sem rotação (qualidade reduzida).
+        """
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        sprite_state = self.sprite_state()
+        
+        # Ponto central para rotação
+        center_x = (self.x + self.width // 2) * scale
+        center_y = (y + self.height // 2) * scale
+        
+        # Rotações vêm do cache de ângulos pré-gerados do AssetManager
+        # Aplicar rotação se estiver fazendo 360
+        if rotate and self.current_trick == 'spin360' and self.rotation != 0:
+            rotated = self.asset_manager.get_rotated_player_sprite(sprite_state, self.rotation)
+            return rotated, rotated.get_rect(center=(center_x, center_y)), None
+        # Aplicar flip do skate para kickflip/heelflip
+        elif rotate and self.current_trick in ['kickflip', 'heelflip'] and self.board_flip != 0:
+            # Rotaciona o sprite inteiro (simplificado) - efeito de flip sutil
+            flipped = self.asset_manager.get_rotated_player_sprite(sprite_state, self.board_flip * 0.3)
+            return flipped, flipped.get_rect(center=(center_x, center_y)), None
+        else:
+            # Sprite normal, direto do atlas
+            return atlas.draw_item(('player', sprite_state), (self.x * scale, y * scale))
+    
+    def get_rect(self):
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+class Obstacle:
+    # Sem __dict__: um obstáculo ocupa pouca memória e é reaproveitado pelo ObstaclePool
+    __slots__ = ('track', 'track_x', 'prev_track_x', 'y', 'type', 'width', 'height', 'color', 'grindable', 'sprite',
+                 'passed', 'asset_manager')
+
+    def __init__(self, x, obstacle_type='barrier', asset_manager=None):
+        self.asset_manager = asset_manager
+        self.reset(x, obstacle_type)
+
+    def reset(self, x, obstacle_type):
+        """Reinicia o obstáculo com outro tipo e posição (usado ao sair do pool)"""
+        kind = OBSTACLE_TYPES[obstacle_type]
+        self.track = None  # ObstacleTrack que rola o obstáculo (None: movido pelo próprio update)
+        self.track_x = x  # Posição no referencial da pista (fora de pista, a própria x)
+        self.prev_track_x = x
+        self.type = obstacle_type
+        self.passed = False
+        self.width = kind.width
+        self.height = kind.height
+        self.y = kind.y
+        self.color = kind.color
+        self.grindable = kind.grindable
+        self.sprite = kind.sprite
+    
+    @property
+    def x(self):
+        """Posição na tela: a posição na pista menos quanto a pista já rolou"""
+        track = self.track
+        if track is None:
+            return self.track_x
+        return self.track_x - track.distance
+    
+    @property
+    def prev_x(self):
+        """Posição na tela no tick anterior (para interpolar o desenho)"""
+        track = self.track
+        if track is None:
+            return self.prev_track_x
+        return self.track_x - track.prev_distance
+    
+    def update(self, speed):
+        """Move um obstáculo fora de pista (na pista, quem rola é a ObstacleTrack)"""
+        self.prev_track_x = self.track_x
+        self.track_x -= speed
+    
+    def draw(self, screen, alpha=1.0):
+        # Retorna a área desenhada (usada pelo renderizador de retângulos sujos)
+        # alpha: fração do caminho entre o tick anterior (0) e o atual (1)
+        # Usar sprite se disponível, caso contrário usar método de desenho
+        if self.asset_manager:
+            return screen.blit(*self.draw_item(self.asset_manager.atlas, alpha))
+        else:
+            return self.draw_shape(screen, alpha)
+    
+    def draw_shape(self, screen, alpha=1.0, scale=1.0):
+        """Método de desenho alternativo, com formas do pygame.draw (sem sprites)"""
+        x = (self.prev_x + (self.x - self.prev_x) * alpha) * scale
+        y = self.y * scale
+        width = self.width * scale
+        height = self.height * scale
+        outline = max(1, round(2 * scale))
+        if self.type == 'ramp':
+            points = [
+                (x, y + height),
+                (x + width, y + height),
+                (x + self.width // 2 * scale, y)
+            ]
+            pygame.draw.polygon(screen, self.color, points)
+            return pygame.draw.polygon(screen, BLACK, points, outline)
+        elif self.type == 'rail':
+            rect = pygame.Rect(x, y, width, height)
+            pygame.draw.rect(screen, self.color, rect)
+            pygame.draw.rect(screen, BLACK, rect, outline)
+            shine_rect = pygame.Rect(x + 2 * scale, y + 1 * scale, width - 4 * scale, 3 * scale)
+            pygame.draw.rect(screen, WHITE, shine_rect)
+            return rect
+        else:
+            rect = pygame.Rect(x, y, width, height)
+            pygame.draw.rect(screen, self.color, rect)
+            pygame.draw.rect(screen, BLACK, rect, outline)
+            return rect
+    
+    def draw_item(self, atlas, alpha=1.0, scale=1.0):
+        """Tupla (superfície, destino, área) do obstáculo para Surface.blits (ver Player.draw_item)"""
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        return atlas.image, (x * scale, self.y * scale), atlas.regions['obstacle', self.sprite]
+    
+    def get_rect(self):
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+class ObstaclePool:
+    """Obstáculos fora da tela guardados para reaproveitar nos próximos spawns
+
+    Em regime (obstáculos entrando e saindo na mesma taxa) nenhum objeto novo é
+    criado, então a partida longa não acumula lixo para o coletor.
+    """
+    def __init__(self, asset_manager=None):
+        self.asset_manager = asset_manager
+        self.free = []
+        self.created = 0
+
+    def acquire(self, x, obstacle_type):
+        if self.free:
+            obstacle = self.free.pop()
+            obstacle.reset(x, obstacle_type)
+            return obstacle
+        self.created += 1
+        return Obstacle(x, obstacle_type, self.asset_manager)
+
+    def release(self, obstacle):
+        self.free.append(obstacle)
+
+class ObstacleTrack:
+    """Obstáculos da pista ordenados por x, com consultas por faixa horizontal
+
+    Todos nascem na borda direita e andam para a esquerda na mesma velocidade,
+    então a ordem de criação já é a ordem por x: inserir é um append e os que
+    saem da tela estão sempre no começo da lista. As consultas partem de um
+    cursor que acompanha a posição do jogador, então cada tick olha só os
+    obstáculos próximos dele em vez de percorrer a pista inteira.
+
+    Os obstáculos ficam parados no referencial da pista (track_x); quem anda é
+    a pista, com a distância rolada. Avançar um tick só soma a velocidade à
+    distância, sem tocar em nenhum obstáculo: o x na tela é track_x - distance.
+    """
+    # Acima deste número de entradas já removidas, a lista é compactada
+    COMPACT_THRESHOLD = 64
+
+    def __init__(self, pool=None):
+        self.pool = pool     # Recebe os obstáculos removidos, se houver
+        self._items = []
+        self._head = 0       # Índice do primeiro obstáculo ainda na pista
+        self._cursor = 0     # Início da última consulta
+        self._unpassed = 0   # Antes deste índice todos já foram pontuados
+        self.max_width = 0   # Largura do maior obstáculo já inserido
+        self.distance = 0.0  # Quanto a pista rolou até o tick atual e até o anterior
+        self.prev_distance = 0.0
+
+    def __len__(self):
+        return len(self._items) - self._head
+
+    def __iter__(self):
+        items = self._items
+        for i in range(self._head, len(items)):
+            yield items[i]
+
+    def append(self, obstacle):
+        items = self._items
+        self.max_width = max(self.max_width, obstacle.width)
+        # Da posição na tela para a posição na pista
+        obstacle.track_x = obstacle.x + self.distance
+        obstacle.track = self
+        if len(items) == self._head or items[-1].track_x <= obstacle.track_x:
+            items.append(obstacle)
+            return
+        # Fora de ordem (só acontece se alguém criar obstáculos fora da borda)
+        index = bisect.bisect_right(items, obstacle.track_x, lo=self._head, key=lambda o: o.track_x)
+        items.insert(index, obstacle)
+        self._cursor = min(self._cursor, index)
+        self._unpassed = min(self._unpassed, index)
+
+    def update(self, speed):
+        """Rola a pista inteira um tick (custo constante, qualquer que seja o número de obstáculos)"""
+        self.prev_distance = self.distance
+        self.distance += speed
+
+    def _start(self, left):
+        # Primeiro obstáculo que ainda pode alcançar `left`: x > left - maior largura
+        items = self._items
+        bound = left - self.max_width
+        distance = self.distance
+        head = self._head
+        n = len(items)
+        i = self._cursor
+        while i > head and items[i - 1].track_x - distance > bound:
+            i -= 1
+        while i < n and items[i].track_x - distance <= bound:
+            i += 1
+        self._cursor = i
+        return i
+
+    def overlapping(self, left, right):
+        """Obstáculos com alguma parte entre left e right, em ordem de x"""
+        items = self._items
+        distance = self.distance
+        found = []
+        n = len(items)
+        i = self._start(left)
+        while i < n:
+            obstacle = items[i]
+            obstacle_x = obstacle.track_x - distance
+            if obstacle_x >= right:
+                break
+            if obstacle_x + obstacle.width > left:
+                found.append(obstacle)
+            i += 1
+        return found
+
+    def mark_passed(self, x):
+        """Marca como pontuados os que ficaram totalmente à esquerda de x; retorna quantos"""
+        items = self._items
+        distance = self.distance
+        n = len(items)
+        count = 0
+        i = self._unpassed
+        # Só quem começa antes de x pode ter terminado antes dele
+        while i < n and items[i].track_x - distance < x:
+            obstacle = items[i]
+            if not obstacle.passed and obstacle.track_x - distance + obstacle.width < x:
+                obstacle.passed = True
+                count += 1
+            i += 1
+        if count:
+            i = self._unpassed
+            while i < n and items[i].passed:
+                i += 1
+            self._unpassed = i
+        return count
+
+    def clear(self):
+        """Esvazia a pista devolvendo todos os obstáculos ao pool"""
+        if self.pool is not None:
+            for obstacle in self:
+                self.pool.release(obstacle)
+        self._items.clear()
+        self._head = self._cursor = self._unpassed = 0
+        self.distance = self.prev_distance = 0.0
+
+    def remove_offscreen(self):
+        """Remove do começo da pista os obstáculos que já saíram da tela"""
+        items = self._items
+        head = self._head
+        pool = self.pool
+        distance = self.distance
+        while head < len(items) and items[head].track_x - distance + items[head].width < 0:
+            if pool is not None:
+                pool.release(items[head])
+            items[head] = None
+            head += 1
+        if head > self.COMPACT_THRESHOLD and head * 2 > len(items):
+            del items[:head]
+            self._cursor -= head
+            self._unpassed -= head
+            head = 0
+        self._head = head
+        # Os cursores nunca apontam para entradas removidas
+        self._cursor = max(self._cursor, head)
+        self._unpassed = max(self._unpassed, head)
+
+def nearby(obstacles, left, right):
+    """Obstáculos que podem estar entre left e right (todos, se não for uma ObstacleTrack)"""
+    if isinstance(obstacles, ObstacleTrack):
+        return obstacles.overlapping(left, right)
+    return obstacles
+
+class InputFrame:
+    """Entrada de um tick: máscara de bits com as teclas usadas pelo jogador"""
+    __slots__ = ('mask',)
+
+    LEFT = 1
+    RIGHT = 2
+    DOWN = 4
+    UP = 8
+    SPACE = 16
+
+    KEY_BITS = {
+        pygame.K_LEFT: LEFT,
+        pygame.K_RIGHT: RIGHT,
+        pygame.K_DOWN: DOWN,
+        pygame.K_UP: UP,
+        pygame.K_SPACE: SPACE
+    }
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    @classmethod
+    def from_pressed(cls, keys):
+        """Cria a entrada a partir de pygame.key.get_pressed()"""
+        mask = 0
+        for key, bit in cls.KEY_BITS.items():
+            if keys[key]:
+                mask |= bit
+        return cls(mask)
+
+    def __getitem__(self, key):
+        # Mesma interface de pygame.key.get_pressed() para o Player
+        return bool(self.mask & self.KEY_BITS.get(key, 0))
+
+class Simulation:
+    """Estado completo de uma partida, avançado um tick por vez sem renderizar"""
+    def __init__(self, asset_manager=None, rng=None, seed=None, spawn_rate=90, min_spawn_rate=60, max_speed=12):
+        self.asset_manager = asset_manager
+        # Gerador usado para sortear obstáculos: com semente a partida é reproduzível,
+        # sem gerador nem semente usa o módulo random global
+        self.seed = seed
+        self.rng = rng if rng is not None else random
+        # Dificuldade: frames entre obstáculos no início e no limite, velocidade máxima
+        self.spawn_rate = spawn_rate
+        self.min_spawn_rate = min_spawn_rate
+        self.max_speed = max_speed
+        self.obstacle_pool = ObstaclePool(asset_manager)
+        self.obstacles = ObstacleTrack(self.obstacle_pool)
+        self.reset()
+
+    def reset(self):
+        if self.seed is not None:
+            self.rng = random.Random(self.seed)
+        self.player = Player(100, GROUND_HEIGHT - 80, self.asset_manager)
+        self.obstacles.clear()
+        self.score = 0
+        self.speed = 5
+        self.obstacle_timer = 0
+        self.obstacle_spawn_rate = self.spawn_rate  # frames entre obstáculos
+        self.ticks = 0
+        self.game_over = False
+        self.death_cause = None  # Tipo do obstáculo que encerrou a partida
+
+    def step(self, keys):
+        """Avança um tick com a entrada dada (InputFrame ou get_pressed())"""
+        if self.game_over:
+            return
+        self.update_player(keys)
+        self.update_obstacles()
+
+    def update_player(self, keys):
+        """Primeira fase do tick: entrada, física e manobras do jogador"""
+        self.ticks += 1
+        trick_bonus = self.player.update(keys, self.obstacles)
+        if trick_bonus > 0:
+            self.score += trick_bonus
+
+    def update_obstacles(self):
+        """Segunda fase do tick: geração, movimento, colisões, pontuação e velocidade"""
+        # Gerar obstáculos
+        self.obstacle_timer += 1
+        if self.obstacle_timer >= self.obstacle_spawn_rate:
+            self.obstacle_timer = 0
+            obstacle_type = self.rng.choice(SPAWN_CHOICES)
+            self.obstacles.append(self.obstacle_pool.acquire(SCREEN_WIDTH, obstacle_type))
+
+        # Atualizar obstáculos
+        player = self.player
+        obstacles = self.obstacles
+        obstacles.update(self.speed)
+
+        # Verificar colisão só com os obstáculos na faixa do jogador (mas não para
+        # rampas - rampas são amigáveis!). A margem de 1px cobre o truncamento do Rect.
+        player_rect = player.get_rect()
+        for obstacle in obstacles.overlapping(player.x - 1, player.x + player.width + 1):
+            if obstacle.type != 'ramp' and player_rect.colliderect(obstacle.get_rect()):
+                if self.is_fatal_collision(obstacle):
+                    self.game_over = True
+                    if self.death_cause is None:
+                        self.death_cause = obstacle.type
+
+        # Pontuar
+        self.score += 10 * obstacles.mark_passed(player.x)
+
+        # Remover obstáculos fora da tela
+        obstacles.remove_offscreen()
+
+        # Aumentar velocidade ao longo do tempo
+        if self.score > 0 and self.score % 100 == 0:
+            self.speed = min(self.speed + 0.1, self.max_speed)
+            self.obstacle_spawn_rate = max(self.obstacle_spawn_rate - 1, self.min_spawn_rate)
+
+    def is_fatal_collision(self, obstacle):
+        """Decide se uma colisão com o obstáculo encerra a partida"""
+        # Verificar se é uma colisão fatal (de frente) ou se o jogador está em cima (grind)
+        player = self.player
+        player_bottom = player.y + player.height
+        player_top = player.y
+        player_center_x = player.x + player.width // 2
+        player_left = player.x
+        player_right = player.x + player.width
+
+        obstacle_top = obstacle.y
+        obstacle_bottom = obstacle.y + obstacle.height
+        obstacle_left = obstacle.x
+        obstacle_right = obstacle.x + obstacle.width
+
+        # Verificar se o jogador está acima do obstáculo (pode fazer grind)
+        # O jogador está "em cima" se a parte de baixo dele está próxima do topo do obstáculo
+        if obstacle.grindable:
+            # Verificar se o jogador está acima do topo do obstáculo
+            # Margem maior para permitir pousar em cima
+            if (player_bottom >= obstacle_top - 15 and
+                player_bottom <= obstacle_top + 20 and
+                player_center_x >= obstacle_left - 15 and
+                player_center_x <= obstacle_right + 15):
+                return False
+
+        # Só é game over se não estiver em cima (colisão de frente/lateral)
+        # Colisão de frente acontece quando o jogador bate na lateral do obstáculo
+        collision_from_side = (
+            (player_right > obstacle_left and player_left < obstacle_left + 5) or
+            (player_left < obstacle_right and player_right > obstacle_right - 5)
+        )
+        # Verificar se é colisão de baixo (jogador está abaixo do obstáculo)
+        collision_from_bottom = player_top < obstacle_bottom and player_bottom < obstacle_top
+
+        # Se colidir de frente ou de baixo, é game over
+        return collision_from_side or collision_from_bottom
+
+def run_headless(ticks, seed=None):
+    """Executa partidas com entradas aleatórias e retorna ticks por segundo"""
+    input_rng = random.Random(seed)
+    simulation = Simulation()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if simulation.game_over:
+            simulation.reset()
+        simulation.step(InputFrame(input_rng.getrandbits(5)))
+    elapsed = time.perf_counter() - start
+    return ticks / elapsed if elapsed > 0 else float('inf')
+
+if __name__ == "__main__":
+    # Teste de carga da física e das colisões: python simulation.py [ticks]
+    total_ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"{total_ticks} ticks a {run_headless(total_ticks):.0f} ticks/s")
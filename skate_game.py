@@ -1,439 +1,163 @@
+import time
+IMPORT_START = time.perf_counter()  # Início da inicialização medida por --profile-startup
+
 import pygame
+PYGAME_IMPORTED = time.perf_counter()
+import argparse
+import multiprocessing
+import os
 import random
 import sys
 from enum import Enum
-from assets import AssetManager
+from assets import AssetManager, AssetLoader
+from profiler import FrameProfiler, ProfilerOverlay, StartupProfiler
+from quality import QualityGovernor, LOW_RENDER_SCALE
+from render_cache import TextLabel, GlyphAtlas
+from renderer import DirtyRectRenderer, ScrollingLayer
+from replay import ReplayRecorder
+from simulation import (
+    Simulation, InputFrame,
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, GROUND_HEIGHT,
+    WHITE, BLACK, BLUE, GREEN, RED, DARK_GRAY, YELLOW
+)
+IMPORT_END = time.perf_counter()
+
+REPLAY_PATH = 'replays/ultima_partida.skr'
+PROFILE_PATH = 'profiles/quadros.csv'  # Destino do F4 (tempos dos últimos frames)
 
-# Inicializar Pygame
-pygame.init()
-pygame.mixer.init()  # Inicializar mixer de áudio
+# Menu: (texto, fonte, y do centro)
+MENU_LINES = [
+    ("JOGO DE SKATE", 'large', 80),  # Título do jogo
+    ("Pressione ESPAÇO para Começar", 'medium', 150),
+    # Explicação sobre o jogo
+    ("Desvie de obstáculos e faça manobras para ganhar pontos!", 'small', 200),
+    ("Use as rampas para ganhar altura e fazer manobras incríveis!", 'small', 230),
+    # Controles
+    ("CONTROLES:", 'small', 280),
+    ("ESPAÇO/SETA CIMA = Ollie (Pulo)", 'small', 310),
+    ("SETA ESQUERDA = Kickflip | SETA DIREITA = Heelflip", 'small', 340),
+    ("SETA BAIXO = 360° Spin", 'small', 370),
+    # Dica sobre grind
+    ("DICA: Pouse em cima de barreiras ou rails para fazer grind!", 'small', 410),
+    # Pontuação das manobras
+    ("PONTUAÇÃO DAS MANOBRAS:", 'small', 450),
+    ("Ollie: 10 pts | Kickflip/Heelflip: 30 pts", 'small', 480),
+    ("360° Spin: 50 pts | Grind: 40 pts", 'small', 510),
+    ("BÔNUS: Manobras feitas em rampas ganham +50% de pontos!", 'small', 540)
+]
+IDLE_FPS = 20  # Telas paradas (menu, fim de jogo) não precisam de 60 FPS
+MAX_FPS = 144  # Limite de quadros desenhados durante a partida (0 = sem limite)
 
-# Constantes
-SCREEN_WIDTH = 1000
-SCREEN_HEIGHT = 600
-FPS = 60
-GRAVITY = 0.8
-GROUND_HEIGHT = SCREEN_HEIGHT - 100
+# A física avança em passos fixos de 1/FPS s, independente da taxa de quadros
+TICK_SECONDS = 1 / FPS
+MAX_TICKS_PER_FRAME = 5  # Após um travamento, descarta o atraso em vez de acelerar o jogo
 
-# Cores
-WHITE = (255, 255, 255)
-BLACK = (0, 0, 0)
-BLUE = (100, 150, 255)
-GREEN = (50, 200, 50)
-RED = (255, 50, 50)
-ORANGE = (255, 165, 0)
-GRAY = (128, 128, 128)
-DARK_GRAY = (64, 64, 64)
-YELLOW = (255, 255, 0)
+# Fração da velocidade da partida com que cada camada do cenário rola (paralaxe)
+BACKGROUND_SCROLL = 0.2
+GROUND_SCROLL = 1.0
+
+# Nomes das manobras exibidos no HUD
+TRICK_TRANSLATIONS = {
+    'ollie': 'OLLIE',
+    'kickflip': 'KICKFLIP',
+    'heelflip': 'HEELFLIP',
+    'spin360': '360° SPIN',
+    'grind': 'GRIND'
+}
 
 class GameState(Enum):
     MENU = 1
     PLAYING = 2
     GAME_OVER = 3
 
-class Player:
-    def __init__(self, x, y, asset_manager):
-        self.x = x
-        self.y = y
-        self.width = 60
-        self.height = 80
-        self.vel_y = 0
-        self.jump_power = -15
-        self.on_ground = False
-        self.animation_frame = 0
-        self.animation_speed = 0.2
-        self.asset_manager = asset_manager
-        
-        # Sistema de manobras
-        self.current_trick = None
-        self.trick_progress = 0
-        self.trick_duration = 0
-        self.rotation = 0  # Para rotações de 360 graus
-        self.board_flip = 0  # Para kickflip/heelflip
-        self.trick_completed = False
-        self.trick_bonus = 0
-        self.queued_trick = None  # Manobra na fila para começar ao pular
-        self.last_key_state = {}  # Rastrear estados anteriores das teclas para detectar pressionamentos
-        self.on_ramp = False  # Rastrear se o jogador está na rampa
-        self.ramp_boost = False  # Rastrear se o jogador recebeu boost da rampa
-        
-    def update(self, keys, obstacles):
-        # Detectar transição de não pressionado para pressionado
-        key_pressed = {}
-        key_pressed[pygame.K_LEFT] = keys[pygame.K_LEFT] and not self.last_key_state.get(pygame.K_LEFT, False)
-        key_pressed[pygame.K_RIGHT] = keys[pygame.K_RIGHT] and not self.last_key_state.get(pygame.K_RIGHT, False)
-        key_pressed[pygame.K_DOWN] = keys[pygame.K_DOWN] and not self.last_key_state.get(pygame.K_DOWN, False)
-        key_pressed[pygame.K_UP] = keys[pygame.K_UP] and not self.last_key_state.get(pygame.K_UP, False)
-        key_pressed[pygame.K_SPACE] = keys[pygame.K_SPACE] and not self.last_key_state.get(pygame.K_SPACE, False)
-        
-        # Atualizar estados anteriores das teclas
-        self.last_key_state[pygame.K_LEFT] = keys[pygame.K_LEFT]
-        self.last_key_state[pygame.K_RIGHT] = keys[pygame.K_RIGHT]
-        self.last_key_state[pygame.K_DOWN] = keys[pygame.K_DOWN]
-        self.last_key_state[pygame.K_UP] = keys[pygame.K_UP]
-        self.last_key_state[pygame.K_SPACE] = keys[pygame.K_SPACE]
-        
-        # Lidar com entradas de manobras quando no ar (permite se a tecla for pressionada OU mantida)
-        if not self.on_ground:
-            if self.current_trick is None:
-                # Começar nova manobra - verificar se a tecla foi pressionada ou mantida
-                if keys[pygame.K_LEFT]:
-                    self.start_trick('kickflip')
-                elif keys[pygame.K_RIGHT]:
-                    self.start_trick('heelflip')
-                elif keys[pygame.K_DOWN]:
-                    self.start_trick('spin360')
-            # Também permite que manobras sejam iniciadas mesmo se já estiver fazendo uma (para combos)
-            elif self.current_trick == 'ollie' and self.trick_progress < 15:
-                # Pode transicionar de ollie para outras manobras cedo
-                if keys[pygame.K_LEFT]:
-                    self.start_trick('kickflip')
-                elif keys[pygame.K_RIGHT]:
-                    self.start_trick('heelflip')
-                elif keys[pygame.K_DOWN]:
-                    self.start_trick('spin360')
-        else:
-            # No chão - colocar manobras na fila
-            if key_pressed[pygame.K_LEFT]:
-                self.queued_trick = 'kickflip'
-            elif key_pressed[pygame.K_RIGHT]:
-                self.queued_trick = 'heelflip'
-            elif key_pressed[pygame.K_DOWN]:
-                self.queued_trick = 'spin360'
-        
-        # Pulo regular (Ollie)
-        if keys[pygame.K_SPACE] or keys[pygame.K_UP]:
-            if self.on_ground:
-                self.vel_y = self.jump_power
-                self.on_ground = False
-                # Começar ollie ou manobra na fila
-                if self.queued_trick:
-                    self.start_trick(self.queued_trick)
-                    self.queued_trick = None
-                else:
-                    self.start_trick('ollie')
-        
-        # Atualizar manobra atual
-        if self.current_trick:
-            self.trick_progress += 1
-            self.update_trick_animation()
-            
-            # Verificar se a manobra está completa
-            if self.trick_progress >= self.trick_duration:
-                if not self.trick_completed:
-                    self.trick_completed = True
-                    self.trick_bonus = self.get_trick_bonus()
-                # Resetar manobra ao pousar
-                if self.on_ground:
-                    bonus = self.trick_bonus
-                    self.reset_trick()
-                    return bonus
-        
-        # Aplicar gravidade
-        self.vel_y += GRAVITY
-        
-        # Atualizar posição
-        self.y += self.vel_y
-        
-        # Verificar grind (em rails/barreiras)
-        self.check_grind(obstacles)
-        
-        # Verificar interação com rampa
-        self.check_ramp(obstacles)
-        
-        # Colisão com o chão
-        ground_y = GROUND_HEIGHT - self.height
-        if self.y >= ground_y:
-            self.y = ground_y
-            self.vel_y = 0
-            self.on_ground = True
-            self.on_ramp = False
-            if self.current_trick and self.trick_completed:
-                bonus = self.trick_bonus
-                self.reset_trick()
-                return bonus
-            elif self.current_trick:
-                self.reset_trick()  # Manobra falhou
-        
-        # Atualizar animação
-        self.animation_frame += self.animation_speed
-        if self.animation_frame >= 4:
-            self.animation_frame = 0
-        
-        return 0
-    
-    def start_trick(self, trick_name):
-        self.current_trick = trick_name
-        self.trick_progress = 0
-        self.trick_completed = False
-        self.trick_bonus = 0
-        
-        if trick_name == 'ollie':
-            self.trick_duration = 20
-        elif trick_name == 'kickflip':
-            self.trick_duration = 30
-        elif trick_name == 'heelflip':
-            self.trick_duration = 30
-        elif trick_name == 'spin360':
-            self.trick_duration = 40
-        elif trick_name == 'grind':
-            self.trick_duration = 60
-    
-    def update_trick_animation(self):
-        if self.current_trick == 'spin360':
-            self.rotation = (self.trick_progress / self.trick_duration) * 360
-        elif self.current_trick == 'kickflip':
-            self.board_flip = (self.trick_progress / self.trick_duration) * 360
-        elif self.current_trick == 'heelflip':
-            self.board_flip = -(self.trick_progress / self.trick_duration) * 360
-        elif self.current_trick == 'ollie':
-            # Ollie apenas tem pulo mais alto, sem animação especial
-            pass
-    
-    def get_trick_bonus(self):
-        if not self.trick_completed:
-            return 0
-        # Pontuações base para cada manobra
-        bonuses = {
-            'ollie': 10,
-            'kickflip': 30,
-            'heelflip': 30,
-            'spin360': 50,
-            'grind': 40
-        }
-        base_bonus = bonuses.get(self.current_trick, 0)
-        
-        # Multiplicador de bônus se a manobra foi feita na/de uma rampa
-        if self.ramp_boost:
-            base_bonus = int(base_bonus * 1.5)  # 50% de bônus para manobras na rampa
-        
-        return base_bonus
-    
-    def reset_trick(self):
-        self.current_trick = None
-        self.trick_progress = 0
-        self.trick_duration = 0
-        self.rotation = 0
-        self.board_flip = 0
-        self.trick_completed = False
-        self.trick_bonus = 0
-        self.queued_trick = None
-        self.ramp_boost = False  # Resetar boost da rampa quando a manobra reseta
-    
-    def check_grind(self, obstacles):
-        # Verificar se o jogador pode fazer grind no topo de barreiras baixas, rails ou barreiras
-        player_bottom = self.y + self.height
-        player_center_x = self.x + self.width // 2
-        
-        for obstacle in obstacles:
-            if obstacle.type in ['low_barrier', 'barrier', 'rail']:
-                obstacle_top = obstacle.y
-                obstacle_left = obstacle.x
-                obstacle_right = obstacle.x + obstacle.width
-                
-                # Verificar se o jogador está acima e alinhado com o obstáculo
-                if (player_bottom >= obstacle_top - 5 and 
-                    player_bottom <= obstacle_top + 10 and
-                    player_center_x >= obstacle_left and 
-                    player_center_x <= obstacle_right and
-                    abs(self.vel_y) < 2):
-                    # Começar grind
-                    if self.current_trick != 'grind':
-                        self.start_trick('grind')
-                    self.y = obstacle_top - self.height
-                    self.vel_y = 0
-                    self.on_ground = False
-                    return
-    
-    def check_ramp(self, obstacles):
-        # Verificar se o jogador está na ou passando por uma rampa
-        player_bottom = self.y + self.height
-        player_center_x = self.x + self.width // 2
-        player_left = self.x
-        player_right = self.x + self.width
-        
-        was_on_ramp = self.on_ramp
-        self.on_ramp = False
-        
-        for obstacle in obstacles:
-            if obstacle.type == 'ramp':
-                ramp_left = obstacle.x
-                ramp_right = obstacle.x + obstacle.width
-                ramp_top = obstacle.y
-                ramp_bottom = obstacle.y + obstacle.height
-                
-                # Verificar se o jogador está colidindo com a rampa
-                if (player_right > ramp_left and player_left < ramp_right and
-                    player_bottom > ramp_top and self.y < ramp_bottom):
-                    
-                    self.on_ramp = True
-                    
-                    # Calcular posição na rampa (0 = esquerda, 1 = direita)
-                    ramp_pos = (player_center_x - ramp_left) / obstacle.width if obstacle.width > 0 else 0.5
-                    ramp_center_x = ramp_left + obstacle.width // 2
-                    
-                    # Dar boost ao subir a rampa (lado esquerdo, aproximando do centro)
-                    if (ramp_pos > 0.2 and ramp_pos < 0.6 and 
-                        not self.ramp_boost and 
-                        player_center_x < ramp_center_x + 10):
-                        # Dar boost vertical
-                        if self.vel_y > -8:  # Apenas dar boost se não estiver já pulando muito alto
-                            self.vel_y = -22  # Boost forte da rampa
-                            self.ramp_boost = True
-                            # Se não estiver fazendo uma manobra, começar ollie automaticamente
-                            if not self.current_trick:
-                                self.start_trick('ollie')
-                    
-                    # Ajustar posição do jogador para estar na superfície da rampa
-                    # A rampa é triangular, então calcular posição Y baseada em X
-                    if player_center_x < ramp_center_x:
-                        # Lado esquerdo da rampa (subindo)
-                        ramp_slope = (ramp_top - ramp_bottom) / (obstacle.width // 2) if obstacle.width > 0 else 0
-                        relative_x = player_center_x - ramp_left
-                        ramp_y = ramp_bottom - (relative_x * ramp_slope)
-                    else:
-                        # Lado direito da rampa (descendo)
-                        ramp_slope = (ramp_bottom - ramp_top) / (obstacle.width // 2) if obstacle.width > 0 else 0
-                        relative_x = player_center_x - ramp_center_x
-                        ramp_y = ramp_top + (relative_x * ramp_slope)
-                    
-                    # Definir posição do jogador na rampa
-                    target_y = ramp_y - self.height
-                    if self.y + self.height > ramp_y:
-                        self.y = target_y
-                        self.on_ground = False
-                        # Diminuir velocidade de descida na rampa, mas permitir movimento para cima
-                        if self.vel_y > 0:
-                            self.vel_y = max(self.vel_y * 0.5, 0.5)
-                    
-                    return
-        
-        # Resetar boost da rampa ao sair dela
-        if was_on_ramp and not self.on_ramp:
-            # Manter flag de boost por um tempo após sair da rampa para permitir conclusão da manobra
-            pass
-    
-    def draw(self, screen):
-        # Determinar qual sprite usar
-        sprite_state = 'idle'
-        if self.current_trick == 'ollie':
-            sprite_state = 'ollie'
-        elif self.current_trick == 'kickflip':
-            sprite_state = 'kickflip'
-        elif self.current_trick == 'grind':
-            sprite_state = 'grind'
-        elif self.current_trick:
-            sprite_state = 'ollie'  # Padrão para ollie em outras manobras
-        
-        # Obter o sprite
-        sprite = self.asset_manager.get_player_sprite(sprite_state)
-        
-        # Ponto central para rotação
-        center_x = self.x + self.width // 2
-        center_y = self.y + self.height // 2
-        
-        # Aplicar rotação se estiver fazendo 360
-        if self.current_trick == 'spin360' and self.rotation != 0:
-            rotated = pygame.transform.rotate(sprite, self.rotation)
-            rot_rect = rotated.get_rect(center=(center_x, center_y))
-            screen.blit(rotated, rot_rect)
-        # Aplicar flip do skate para kickflip/heelflip
-        elif self.current_trick in ['kickflip', 'heelflip'] and self.board_flip != 0:
-            # Criar uma cópia e rotacionar apenas a área do skate (simplificado - rotaciona sprite inteiro)
-            flipped = pygame.transform.rotate(sprite, self.board_flip * 0.3)  # Efeito de flip sutil
-            flip_rect = flipped.get_rect(center=(center_x, center_y))
-            screen.blit(flipped, flip_rect)
-        else:
-            # Sprite normal
-            screen.blit(sprite, (self.x, self.y))
-    
-    def get_rect(self):
-        return pygame.Rect(self.x, self.y, self.width, self.height)
-
-class Obstacle:
-    def __init__(self, x, obstacle_type='barrier', asset_manager=None):
-        self.x = x
-        self.type = obstacle_type
-        self.passed = False
-        self.asset_manager = asset_manager
-        
-        if obstacle_type == 'barrier':
-            self.width = 30
-            self.height = 60
-            self.y = GROUND_HEIGHT - self.height
-            self.color = RED
-        elif obstacle_type == 'low_barrier':
-            self.width = 30
-            self.height = 30
-            self.y = GROUND_HEIGHT - self.height
-            self.color = ORANGE
-        elif obstacle_type == 'ramp':
-            self.width = 60
-            self.height = 50  # Rampas muito mais altas
-            self.y = GROUND_HEIGHT - self.height
-            self.color = GREEN
-        elif obstacle_type == 'rail':
-            self.width = 40
-            self.height = 10
-            self.y = GROUND_HEIGHT - self.height - 20
-            self.color = GRAY
-    
-    def update(self, speed):
-        self.x -= speed
-    
-    def draw(self, screen):
-        # Usar sprite se disponível, caso contrário usar método de desenho
-        if self.asset_manager:
-            sprite = self.asset_manager.get_obstacle_sprite(self.type)
-            screen.blit(sprite, (self.x, self.y))
-        else:
-            # Método de desenho alternativo
-            if self.type == 'ramp':
-                points = [
-                    (self.x, self.y + self.height),
-                    (self.x + self.width, self.y + self.height),
-                    (self.x + self.width // 2, self.y)
-                ]
-                pygame.draw.polygon(screen, self.color, points)
-                pygame.draw.polygon(screen, BLACK, points, 2)
-            elif self.type == 'rail':
-                rect = pygame.Rect(self.x, self.y, self.width, self.height)
-                pygame.draw.rect(screen, self.color, rect)
-                pygame.draw.rect(screen, BLACK, rect, 2)
-                shine_rect = pygame.Rect(self.x + 2, self.y + 1, self.width - 4, 3)
-                pygame.draw.rect(screen, WHITE, shine_rect)
-            else:
-                rect = pygame.Rect(self.x, self.y, self.width, self.height)
-                pygame.draw.rect(screen, self.color, rect)
-                pygame.draw.rect(screen, BLACK, rect, 2)
-    
-    def get_rect(self):
-        return pygame.Rect(self.x, self.y, self.width, self.height)
-
 class Game:
-    def __init__(self):
+    def __init__(self, dirty_rects=False, max_fps=MAX_FPS, profile_dump=None, profile_startup=False,
+                 render_scale=1.0, smooth_upscale=False, adaptive_quality=True):
+        self.startup = StartupProfiler(IMPORT_START)
+        self.startup.mark('import pygame', PYGAME_IMPORTED)
+        self.startup.mark('import dos módulos do jogo', IMPORT_END)
+        self.startup.mark('até criar o Game')
+        self.profile_startup = profile_startup  # Mostrar os marcos ao apresentar o menu
+        
+        # Só os subsistemas usados: vídeo (janela e eventos) e fontes.
+        # O mixer é inicializado ao carregar a música, e só se houver música
+        pygame.display.init()
+        pygame.font.init()
+        self.startup.mark('pygame (vídeo e fontes)')
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("2D Skate Game")
+        self.startup.mark('janela')
+        # Modo de retângulos sujos: só as áreas que mudaram são atualizadas na tela
+        self.renderer = DirtyRectRenderer(self.screen) if dirty_rects else None
+        if self.renderer and render_scale != 1:
+            print("Escala de renderização ignorada no modo de retângulos sujos")
+            render_scale = 1.0
+        # Resolução interna: a cena (cenário e sprites) é desenhada numa superfície
+        # menor e ampliada para a janela; o HUD é desenhado depois, em resolução cheia
+        self.render_scale = render_scale
+        self.base_render_scale = render_scale  # Escala pedida; o governador pode baixar
+        self.scene = self.make_scene(render_scale)
+        self.upscale = pygame.transform.smoothscale if smooth_upscale else pygame.transform.scale
+        self._scenery = None
+        self._scenery_key = None
+        # Camadas do cenário que rolam com a partida (fora do modo de retângulos sujos)
+        self._layers = {}  # (id do fundo, id do chão) -> camadas, uma entrada por escala usada
+        self.scroll = 0.0  # Distância percorrida, em pixels, no tick atual e no anterior
+        self.prev_scroll = 0.0
         self.clock = pygame.time.Clock()
+        self.max_fps = max_fps
+        self.interpolation = 1.0  # Fração do próximo tick já decorrida, usada ao desenhar
         self.state = GameState.MENU
         self.font_large = pygame.font.Font(None, 72)
         self.font_medium = pygame.font.Font(None, 48)
         self.font_small = pygame.font.Font(None, 36)
         
-        # Carregar assets
-        self.asset_manager = AssetManager()
-        self.asset_manager.load_assets(SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_HEIGHT)
-        
-        # Carregar música de fundo (mas não tocar ainda)
-        self.load_background_music()
+        # HUD: rótulos fixos renderizados uma vez, números compostos de glifos prontos
+        self.score_label = self.font_medium.render("Pontuação: ", True, BLACK)
+        self.score_digits = GlyphAtlas(self.font_medium, BLACK)
+        self.speed_label = self.font_small.render("Velocidade: ", True, DARK_GRAY)
+        self.speed_digits = GlyphAtlas(self.font_small, DARK_GRAY)
+        self.trick_label = TextLabel(self.font_small)
+        self.ramp_label = self.font_small.render("NA RAMPA!", True, GREEN)
+        
+        # Perfil de frames: sempre coletado, overlay alternado com F3, exportado com F4
+        self.profiler = FrameProfiler()
+        self.profiler_overlay = ProfilerOverlay(self.profiler, pygame.font.Font(None, 22), FPS)
+        self.show_profiler = False
+        self.profile_dump = profile_dump  # Arquivo gravado ao sair, se definido
+        
+        # Overlay semi-transparente do fim de jogo, criado uma vez
+        self.game_over_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.game_over_overlay.set_alpha(180)
+        self.game_over_overlay.fill(BLACK)
+        
+        # Menu e fim de jogo pré-compostos; só são apresentados de novo quando algo muda
+        self._menu_surface = None
+        self._menu_key = None
+        self._game_over_frame = None
+        self._drawn_state = None
+        self.needs_redraw = True
+        
+        # Assets são carregados numa thread no início de run(), com tela de carregamento
+        self.asset_manager = AssetManager(SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_HEIGHT, render_scale=render_scale)
+        # Assets usados para desenhar a cena: os do asset_manager, ou os de outra
+        # escala se o governador de qualidade baixar a resolução
+        self.scene_assets = self.asset_manager
+        self._scene_assets = {render_scale: self.asset_manager}
         self.music_playing = False
         
+        # Qualidade adaptativa: desliga efeitos por estágios quando os frames estouram o orçamento
+        self.quality = QualityGovernor(1 / FPS) if adaptive_quality else None
+        
         self.reset_game()
+        self.startup.mark('resto do Game.__init__')
     
     def load_background_music(self):
         """Carrega a música de fundo (mas não toca)"""
         if self.asset_manager.music_path:
             try:
+                if not pygame.mixer.get_init():
+                    pygame.mixer.init()  # Inicializar mixer de áudio
                 pygame.mixer.music.load(self.asset_manager.music_path)
                 pygame.mixer.music.set_volume(0.5)  # Volume 50%
                 print(f"Música de fundo carregada: {self.asset_manager.music_path}")
@@ -460,18 +184,38 @@ class Game:
             print("Música de fundo parada")
     
     def reset_game(self):
-        self.player = Player(100, GROUND_HEIGHT - 80, self.asset_manager)
-        self.obstacles = []
-        self.score = 0
-        self.speed = 5
-        self.obstacle_timer = 0
-        self.obstacle_spawn_rate = 90  # frames entre obstáculos
+        # Cada partida tem sua semente, gravada junto com as entradas no replay
+        self.simulation = Simulation(self.asset_manager, seed=random.getrandbits(64))
+        self.recorder = ReplayRecorder(self.simulation)
+        self._game_over_frame = None
+        if self.quality:
+            self.quality.reset()  # Frames do menu ou da partida anterior não contam
+    
+    def save_replay(self):
+        """Salva o replay da última partida"""
+        try:
+            os.makedirs(os.path.dirname(REPLAY_PATH), exist_ok=True)
+            self.recorder.to_replay(self.simulation.score).save(REPLAY_PATH)
+            print(f"Replay salvo: {REPLAY_PATH}")
+        except OSError as e:
+            print(f"Erro ao salvar replay: {e}")
     
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                self.needs_redraw = True  # Janela precisa ser redesenhada
+                if self.renderer:
+                    self.renderer.invalidate()
             if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    self.show_profiler = not self.show_profiler
+                    self.needs_redraw = True
+                    if self.renderer:
+                        self.renderer.invalidate()
+                elif event.key == pygame.K_F4:
+                    self.dump_profile(PROFILE_PATH)
                 if self.state == GameState.MENU:
                     if event.key == pygame.K_SPACE or event.key == pygame.K_RETURN:
                         self.state = GameState.PLAYING
@@ -490,216 +234,313 @@ class Game:
         if self.state != GameState.PLAYING:
             return
         
-        keys = pygame.key.get_pressed()
-        trick_bonus = self.player.update(keys, self.obstacles)
-        if trick_bonus > 0:
-            self.score += trick_bonus
-        
-        # Gerar obstáculos
-        self.obstacle_timer += 1
-        if self.obstacle_timer >= self.obstacle_spawn_rate:
-            self.obstacle_timer = 0
-            # Maior chance de rampas
-            obstacle_type = random.choice(['barrier', 'barrier', 'low_barrier', 'ramp', 'ramp', 'rail'])
-            self.obstacles.append(Obstacle(SCREEN_WIDTH, obstacle_type, self.asset_manager))
-        
-        # Atualizar obstáculos
-        for obstacle in self.obstacles[:]:
-            obstacle.update(self.speed)
-            
-            # Verificar colisão (mas não para rampas - rampas são amigáveis!)
-            if obstacle.type != 'ramp' and self.player.get_rect().colliderect(obstacle.get_rect()):
-                # Verificar se é uma colisão fatal (de frente) ou se o jogador está em cima (grind)
-                player_bottom = self.player.y + self.player.height
-                player_top = self.player.y
-                player_center_x = self.player.x + self.player.width // 2
-                player_left = self.player.x
-                player_right = self.player.x + self.player.width
-                
-                obstacle_top = obstacle.y
-                obstacle_bottom = obstacle.y + obstacle.height
-                obstacle_left = obstacle.x
-                obstacle_right = obstacle.x + obstacle.width
-                
-                # Verificar se o jogador está acima do obstáculo (pode fazer grind)
-                # O jogador está "em cima" se a parte de baixo dele está próxima do topo do obstáculo
-                is_on_top = False
-                if obstacle.type in ['low_barrier', 'barrier', 'rail']:
-                    # Verificar se o jogador está acima do topo do obstáculo
-                    # Margem maior para permitir pousar em cima
-                    if (player_bottom >= obstacle_top - 15 and 
-                        player_bottom <= obstacle_top + 20 and
-                        player_center_x >= obstacle_left - 15 and 
-                        player_center_x <= obstacle_right + 15):
-                        is_on_top = True
-                
-                # Só é game over se não estiver em cima (colisão de frente/lateral)
-                # Colisão de frente acontece quando o jogador bate na lateral do obstáculo
-                if not is_on_top:
-                    # Verificar se é colisão lateral (jogador está ao lado do obstáculo)
-                    collision_from_side = (
-                        (player_right > obstacle_left and player_left < obstacle_left + 5) or
-                        (player_left < obstacle_right and player_right > obstacle_right - 5)
-                    )
-                    # Verificar se é colisão de baixo (jogador está abaixo do obstáculo)
-                    collision_from_bottom = player_top < obstacle_bottom and player_bottom < obstacle_top
-                    
-                    # Se colidir de frente ou de baixo, é game over
-                    if collision_from_side or collision_from_bottom:
-                        self.state = GameState.GAME_OVER
-                        self.stop_background_music()  # Parar música no game over
-            
-            # Pontuar
-            if not obstacle.passed and obstacle.x + obstacle.width < self.player.x:
-                obstacle.passed = True
-                self.score += 10
-            
-            # Remover obstáculos fora da tela
-            if obstacle.x + obstacle.width < 0:
-                self.obstacles.remove(obstacle)
-        
-        # Aumentar velocidade ao longo do tempo
-        if self.score > 0 and self.score % 100 == 0:
-            self.speed = min(self.speed + 0.1, 12)
-            self.obstacle_spawn_rate = max(self.obstacle_spawn_rate - 1, 60)
+        keys = InputFrame.from_pressed(pygame.key.get_pressed())
+        self.recorder.record(keys)
+        # Mesmo que simulation.step(), com cada fase medida pelo perfil de frames
+        self.simulation.update_player(keys)
+        self.profiler.lap('player')
+        # O cenário anda o mesmo que os obstáculos neste tick
+        self.prev_scroll = self.scroll
+        self.scroll += self.simulation.speed
+        self.simulation.update_obstacles()
+        self.profiler.lap('obstacles')
+        if self.simulation.game_over:
+            self.state = GameState.GAME_OVER
+            self.stop_background_music()  # Parar música no game over
+            self.save_replay()
     
     def draw(self):
-        # Desenhar sprite de fundo
-        self.screen.blit(self.asset_manager.background, (0, 0))
+        if self.state == GameState.PLAYING:
+            if self.renderer:
+                self.draw_dirty()
+            else:
+                # As camadas do cenário cobrem a tela inteira
+                self.draw_game(alpha=self.interpolation)
+                self.draw_profiler()
+                self.profiler.lap('draw')
+                pygame.display.flip()
+                self.profiler.lap('flip')
+            self._drawn_state = self.state
+            return
         
+        # Menu e fim de jogo são telas paradas: se já estão na tela, não há nada para redesenhar
+        if self._drawn_state == self.state and not self.needs_redraw:
+            return
         if self.state == GameState.MENU:
             self.draw_menu()
-        elif self.state == GameState.PLAYING:
-            self.draw_game()
         elif self.state == GameState.GAME_OVER:
-            self.draw_game()
-            self.draw_game_over()
-        
+            self.screen.blit(self.get_game_over_frame(), (0, 0))
+        if self.show_profiler:
+            self.draw_profiler()  # Retrato do momento em que a tela parou
+        self._drawn_state = self.state
+        self.needs_redraw = False
+        self.profiler.lap('draw')
         pygame.display.flip()
+        self.profiler.lap('flip')
     
-    def draw_menu(self):
-        # Título do jogo
-        title = self.font_large.render("JOGO DE SKATE", True, BLACK)
-        title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 80))
-        self.screen.blit(title, title_rect)
-        
-        # Instrução para começar
-        instruction = self.font_medium.render("Pressione ESPAÇO para Começar", True, BLACK)
-        inst_rect = instruction.get_rect(center=(SCREEN_WIDTH // 2, 150))
-        self.screen.blit(instruction, inst_rect)
-        
-        # Explicação sobre o jogo
-        desc1 = self.font_small.render("Desvie de obstáculos e faça manobras para ganhar pontos!", True, BLACK)
-        desc1_rect = desc1.get_rect(center=(SCREEN_WIDTH // 2, 200))
-        self.screen.blit(desc1, desc1_rect)
-        
-        desc2 = self.font_small.render("Use as rampas para ganhar altura e fazer manobras incríveis!", True, BLACK)
-        desc2_rect = desc2.get_rect(center=(SCREEN_WIDTH // 2, 230))
-        self.screen.blit(desc2, desc2_rect)
-        
-        # Título dos controles
-        controls_title = self.font_small.render("CONTROLES:", True, BLACK)
-        ctrl_title_rect = controls_title.get_rect(center=(SCREEN_WIDTH // 2, 280))
-        self.screen.blit(controls_title, ctrl_title_rect)
-        
-        # Controles - linha 1
-        controls1 = self.font_small.render("ESPAÇO/SETA CIMA = Ollie (Pulo)", True, BLACK)
-        ctrl1_rect = controls1.get_rect(center=(SCREEN_WIDTH // 2, 310))
-        self.screen.blit(controls1, ctrl1_rect)
-        
-        # Controles - linha 2
-        controls2 = self.font_small.render("SETA ESQUERDA = Kickflip | SETA DIREITA = Heelflip", True, BLACK)
-        ctrl2_rect = controls2.get_rect(center=(SCREEN_WIDTH // 2, 340))
-        self.screen.blit(controls2, ctrl2_rect)
-        
-        # Controles - linha 3
-        controls3 = self.font_small.render("SETA BAIXO = 360° Spin", True, BLACK)
-        ctrl3_rect = controls3.get_rect(center=(SCREEN_WIDTH // 2, 370))
-        self.screen.blit(controls3, ctrl3_rect)
-        
-        # Dica sobre grind
-        tip1 = self.font_small.render("DICA: Pouse em cima de barreiras ou rails para fazer grind!", True, BLACK)
-        tip1_rect = tip1.get_rect(center=(SCREEN_WIDTH // 2, 410))
-        self.screen.blit(tip1, tip1_rect)
-        
-        # Pontuação das manobras
-        score_title = self.font_small.render("PONTUAÇÃO DAS MANOBRAS:", True, BLACK)
-        score_title_rect = score_title.get_rect(center=(SCREEN_WIDTH // 2, 450))
-        self.screen.blit(score_title, score_title_rect)
-        
-        score1 = self.font_small.render("Ollie: 10 pts | Kickflip/Heelflip: 30 pts", True, BLACK)
-        score1_rect = score1.get_rect(center=(SCREEN_WIDTH // 2, 480))
-        self.screen.blit(score1, score1_rect)
-        
-        score2 = self.font_small.render("360° Spin: 50 pts | Grind: 40 pts", True, BLACK)
-        score2_rect = score2.get_rect(center=(SCREEN_WIDTH // 2, 510))
-        self.screen.blit(score2, score2_rect)
-        
-        bonus = self.font_small.render("BÔNUS: Manobras feitas em rampas ganham +50% de pontos!", True, BLACK)
-        bonus_rect = bonus.get_rect(center=(SCREEN_WIDTH // 2, 540))
-        self.screen.blit(bonus, bonus_rect)
+    def draw_dirty(self):
+        """Frame de jogo pelo renderizador de retângulos sujos"""
+        if self._drawn_state != GameState.PLAYING:
+            self.renderer.invalidate()  # Vindo de outra tela: apresentar tudo
+        self.renderer.set_background(self.get_scenery())
+        self.renderer.begin_frame()
+        rects = self.draw_game(scenery=False, alpha=self.interpolation)
+        rects.append(self.draw_profiler())
+        self.profiler.lap('draw')
+        self.renderer.end_frame(rects)
+        self.profiler.lap('flip')
+    
+    def draw_profiler(self):
+        """Overlay do perfil de frames (F3); retorna a área ocupada ou None"""
+        if self.show_profiler:
+            return self.profiler_overlay.draw(self.screen)
+        return None
+    
+    def dump_profile(self, path):
+        try:
+            self.profiler.dump(path)
+            print(f"Perfil de frames salvo: {path}")
+        except OSError as e:
+            print(f"Erro ao salvar perfil de frames: {e}")
+    
+    def get_scenery(self):
+        """Fundo estático do jogo (background + chão), composto uma vez
+
+        Usado pelo modo de retângulos sujos, em que o cenário não rola: com ele
+        rolando a tela inteira mudaria a cada frame.
+        """
+        key = (id(self.asset_manager.background), id(self.asset_manager.ground))
+        if self._scenery_key != key:
+            self._scenery = self.asset_manager.background.copy()
+            self.draw_scenery(self._scenery)
+            self._scenery_key = key
+        return self._scenery
     
-    def draw_game(self):
+    def get_layers(self):
+        """Camadas do cenário: fundo (acima do chão) e chão, montadas uma vez (na escala de renderização)"""
+        background = self.scene_assets.background
+        ground = self.scene_assets.ground
+        key = (id(background), id(ground))
+        layers = self._layers.get(key)
+        if layers is None:
+            ground_y = background.get_height() - ground.get_height()
+            layers = [
+                ScrollingLayer(background, 0, BACKGROUND_SCROLL, (0, 0, background.get_width(), ground_y)),
+                ScrollingLayer(ground, ground_y, GROUND_SCROLL)
+            ]
+            self._layers[key] = layers
+        return layers
+    
+    def draw_layers(self, surface, alpha=1.0):
+        """Cenário rolado até a posição interpolada entre o tick anterior e o atual"""
+        distance = (self.prev_scroll + (self.scroll - self.prev_scroll) * alpha) * self.render_scale
+        layers = self.get_layers()
+        for layer in layers:
+            layer.draw(surface, distance)
+        ground_y = layers[1].y
+        pygame.draw.line(surface, DARK_GRAY, (0, ground_y), (surface.get_width(), ground_y),
+                         max(1, round(2 * self.render_scale)))
+    
+    def draw_scenery(self, surface):
         # Desenhar sprite do chão
-        self.screen.blit(self.asset_manager.ground, (0, GROUND_HEIGHT))
+        surface.blit(self.asset_manager.ground, (0, GROUND_HEIGHT))
         
         # Desenhar linha do chão para profundidade
-        pygame.draw.line(self.screen, DARK_GRAY, (0, GROUND_HEIGHT), 
+        pygame.draw.line(surface, DARK_GRAY, (0, GROUND_HEIGHT), 
                         (SCREEN_WIDTH, GROUND_HEIGHT), 2)
-        
-        # Desenhar obstáculos
-        for obstacle in self.obstacles:
-            obstacle.draw(self.screen)
-        
-        # Desenhar jogador
-        self.player.draw(self.screen)
+    
+    def get_game_over_frame(self):
+        """Último frame da partida com o overlay de fim de jogo, composto uma vez por partida"""
+        if self._game_over_frame is None:
+            if self.renderer:
+                # A partida foi desenhada sobre o cenário estático: o quadro final também
+                self.screen.blit(self.get_scenery(), (0, 0))
+                self.draw_game(scenery=False)
+            else:
+                self.draw_game()
+            self.draw_game_over()
+            self._game_over_frame = self.screen.copy()
+        return self._game_over_frame
+    
+    def get_menu_surface(self):
+        """Menu completo (fundo + textos), composto uma vez e guardado"""
+        # Composto uma vez só: usa o fundo em resolução cheia, mesmo com render_scale < 1
+        background = self.asset_manager.original('background')
+        # Refazer só se os textos ou a resolução mudarem
+        key = (tuple(MENU_LINES), self.screen.get_size(), id(background))
+        if self._menu_key != key:
+            fonts = {'large': self.font_large, 'medium': self.font_medium, 'small': self.font_small}
+            if background.get_size() != self.screen.get_size():
+                menu = pygame.transform.smoothscale(background, self.screen.get_size())
+            else:
+                menu = background.copy()
+            for text, font, y in MENU_LINES:
+                rendered = fonts[font].render(text, True, BLACK)
+                menu.blit(rendered, rendered.get_rect(center=(SCREEN_WIDTH // 2, y)))
+            self._menu_surface = menu
+            self._menu_key = key
+        return self._menu_surface
+    
+    def draw_loading(self, loader):
+        """Tela de carregamento: só textos e retângulos, nada que dependa dos assets"""
+        self.screen.fill(BLUE)
+        title = self.font_large.render("JOGO DE SKATE", True, WHITE)
+        self.screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80)))
+        
+        bar = pygame.Rect(0, 0, SCREEN_WIDTH // 2, 24)
+        bar.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        pygame.draw.rect(self.screen, DARK_GRAY, bar)
+        filled = bar.copy()
+        filled.width = int(bar.width * loader.progress)
+        pygame.draw.rect(self.screen, YELLOW, filled)
+        pygame.draw.rect(self.screen, BLACK, bar, 2)
+        
+        stage = self.font_small.render(f"{loader.stage}... {loader.progress:.0%}", True, WHITE)
+        self.screen.blit(stage, stage.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)))
+        pygame.display.flip()
+    
+    def load_assets(self):
+        """Carrega os assets numa thread mostrando o progresso; False se a janela foi fechada"""
+        loader = AssetLoader(self.asset_manager).start()
+        first_frame = True
+        while not loader.is_done():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return False
+            self.draw_loading(loader)
+            if first_frame:
+                self.startup.mark('primeiro quadro (tela de carregamento)')
+                first_frame = False
+            self.clock.tick(IDLE_FPS)
+        self.startup.mark('assets em segundo plano')
+        
+        # Na thread principal: converter as superfícies e carregar a música (mas não tocar ainda)
+        loader.finish()
+        self.startup.mark('conversão dos assets')
+        if self.quality and self.renderer is None and self.base_render_scale > LOW_RENDER_SCALE:
+            # Assets da resolução reduzida prontos antes da partida: baixar a
+            # qualidade no meio do jogo não pode custar um frame longo
+            self.scene_assets_for(LOW_RENDER_SCALE)
+            self.startup.mark('assets da qualidade reduzida')
+        self.load_background_music()
+        self.startup.mark('música')
+        self.needs_redraw = True
+        return True
+    
+    def draw_menu(self):
+        self.screen.blit(self.get_menu_surface(), (0, 0))
+    
+    def draw_game(self, scenery=True, alpha=1.0):
+        """Desenha a partida e retorna as áreas ocupadas pelos sprites e pelo HUD
+
+        alpha interpola as posições entre o tick anterior e o atual, para o
+        movimento ficar suave em qualquer taxa de quadros.
+        """
+        simulation = self.simulation
+        player = simulation.player
+        screen = self.screen
+        
+        if self.scene is None:
+            rects = self.draw_scene(screen, scenery, alpha)
+        else:
+            # Cena na resolução interna, ampliada direto na janela (sem criar superfície)
+            self.draw_scene(self.scene, scenery, alpha)
+            self.upscale(self.scene, screen.get_size(), screen)
+            rects = [screen.get_rect()]
         
         # Desenhar pontuação
-        score_text = self.font_medium.render(f"Pontuação: {self.score}", True, BLACK)
-        self.screen.blit(score_text, (20, 20))
-        
-        # Desenhar indicador de velocidade
-        speed_text = self.font_small.render(f"Velocidade: {self.speed:.1f}", True, DARK_GRAY)
-        self.screen.blit(speed_text, (20, 70))
-        
-        # Desenhar manobra atual
-        if self.player.current_trick:
-            trick_name = self.player.current_trick.upper()
-            # Traduzir nomes das manobras
-            trick_translations = {
-                'OLLIE': 'OLLIE',
-                'KICKFLIP': 'KICKFLIP',
-                'HEELFLIP': 'HEELFLIP',
-                'SPIN360': '360° SPIN',
-                'GRIND': 'GRIND'
-            }
-            display_name = trick_translations.get(trick_name, trick_name)
+        rects.append(screen.blit(self.score_label, (20, 20)))
+        rects.append(self.score_digits.draw(screen, str(simulation.score), (20 + self.score_label.get_width(), 20)))
+        
+        # Desenhar indicador de velocidade (extra do HUD, some com a qualidade reduzida)
+        hud_extras = not self.quality or self.quality.allows('hud_extras')
+        if hud_extras:
+            rects.append(screen.blit(self.speed_label, (20, 70)))
+            rects.append(self.speed_digits.draw(screen, f"{simulation.speed:.1f}", (20 + self.speed_label.get_width(), 70)))
+        
+        # Desenhar manobra atual (renderizada de novo só quando o texto muda)
+        if player.current_trick:
+            display_name = TRICK_TRANSLATIONS.get(player.current_trick, player.current_trick.upper())
             
-            if self.player.ramp_boost:
+            if player.ramp_boost:
                 display_name += " (RAMPA!)"
-            if self.player.trick_completed:
-                trick_text = self.font_small.render(f"{display_name}!", True, YELLOW)
+            if player.trick_completed:
+                trick_text = self.trick_label.render(f"{display_name}!", YELLOW)
             else:
-                trick_text = self.font_small.render(display_name, True, WHITE)
-            self.screen.blit(trick_text, (20, 110))
+                trick_text = self.trick_label.render(display_name, WHITE)
+            rects.append(screen.blit(trick_text, (20, 110)))
         
         # Desenhar indicador de rampa
-        if self.player.on_ramp:
-            ramp_text = self.font_small.render("NA RAMPA!", True, GREEN)
-            self.screen.blit(ramp_text, (20, 150))
+        if player.on_ramp and hud_extras:
+            rects.append(screen.blit(self.ramp_label, (20, 150)))
+        
+        return rects
+    
+    def draw_scene(self, surface, scenery=True, alpha=1.0):
+        """Cenário, obstáculos e jogador na superfície dada (na escala de renderização)"""
+        simulation = self.simulation
+        scale = self.render_scale
+        quality = self.quality
+        if scenery:
+            self.draw_layers(surface, alpha)
+        
+        # Obstáculos e jogador saem do atlas de sprites, num único blits
+        atlas = self.scene_assets.atlas
+        rotate = not quality or quality.allows('rotation')
+        if not quality or quality.allows('obstacle_sprites'):
+            draw_list = [obstacle.draw_item(atlas, alpha, scale) for obstacle in simulation.obstacles]
+            rects = []
+        else:
+            # Qualidade reduzida: obstáculos com as formas do desenho alternativo
+            draw_list = []
+            rects = [obstacle.draw_shape(surface, alpha, scale) for obstacle in simulation.obstacles]
+        draw_list.append(simulation.player.draw_item(atlas, alpha, scale, rotate))
+        return rects + surface.blits(draw_list)
+    
+    def make_scene(self, render_scale):
+        """Superfície da cena na resolução interna (None: desenhar direto na janela)"""
+        if render_scale == 1:
+            return None
+        scene_size = (max(1, round(SCREEN_WIDTH * render_scale)), max(1, round(SCREEN_HEIGHT * render_scale)))
+        return pygame.Surface(scene_size).convert()
+    
+    def scene_assets_for(self, render_scale):
+        """Assets da cena numa escala, reduzidos uma vez dos já carregados em memória"""
+        assets = self._scene_assets.get(render_scale)
+        if assets is None:
+            assets = self.asset_manager.rescaled(render_scale)
+            self._scene_assets[render_scale] = assets
+        return assets
+    
+    def set_render_scale(self, render_scale):
+        """Troca a resolução interna da cena"""
+        if render_scale == self.render_scale:
+            return
+        self.scene_assets = self.scene_assets_for(render_scale)
+        self.render_scale = render_scale
+        self.scene = self.make_scene(render_scale)
+    
+    def update_quality(self):
+        """Passa o tempo de trabalho do último frame de jogo ao governador e aplica o nível"""
+        work = self.profiler.last() - self.profiler.last('idle')
+        if not self.quality.update(work):
+            return
+        if self.renderer is None:
+            # No modo de retângulos sujos a resolução não muda (ver __init__)
+            full = self.quality.allows('full_resolution')
+            self.set_render_scale(self.base_render_scale if full else min(self.base_render_scale, LOW_RENDER_SCALE))
+        else:
+            self.renderer.invalidate()
     
     def draw_game_over(self):
         # Overlay semi-transparente
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(180)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.game_over_overlay, (0, 0))
         
         game_over = self.font_large.render("FIM DE JOGO", True, RED)
         go_rect = game_over.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
         self.screen.blit(game_over, go_rect)
         
-        final_score = self.font_medium.render(f"Pontuação Final: {self.score}", True, WHITE)
+        final_score = self.font_medium.render(f"Pontuação Final: {self.simulation.score}", True, WHITE)
         fs_rect = final_score.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
         self.screen.blit(final_score, fs_rect)
         
@@ -708,19 +549,73 @@ class Game:
         self.screen.blit(restart, r_rect)
     
     def run(self):
-        running = True
+        running = self.load_assets()
+        accumulator = 0.0
+        previous = time.perf_counter()
         while running:
+            self.profiler.begin_frame()
+            now = time.perf_counter()
+            accumulator = min(accumulator + now - previous, MAX_TICKS_PER_FRAME * TICK_SECONDS)
+            previous = now
+            was_playing = self.state == GameState.PLAYING
             running = self.handle_events()
-            self.update()
+            self.profiler.lap('events')
+            if not was_playing:
+                # O tempo parado no menu ou no fim de jogo não vira ticks de recuperação
+                accumulator = 0.0
+            
+            if self.state == GameState.PLAYING:
+                # Quantos ticks couberem no tempo real decorrido (zero ou vários por quadro)
+                while accumulator >= TICK_SECONDS and self.state == GameState.PLAYING:
+                    self.update()
+                    accumulator -= TICK_SECONDS
+                self.interpolation = accumulator / TICK_SECONDS
+            else:
+                accumulator = 0.0
+            
             self.draw()
-            self.clock.tick(FPS)
+            if self.startup is not None:
+                self.startup.mark('menu na tela')
+                if self.profile_startup:
+                    self.startup.report()
+                self.startup = None
+            self.clock.tick(self.max_fps if self.state == GameState.PLAYING else IDLE_FPS)
+            self.profiler.lap('idle')
+            self.profiler.end_frame()
+            if self.quality and self.state == GameState.PLAYING and self._drawn_state == GameState.PLAYING:
+                self.update_quality()
+        
+        self.asset_manager.report_load_timings()
+        if self.profile_dump:
+            self.dump_profile(self.profile_dump)
         
         # Parar música antes de sair
-        pygame.mixer.music.stop()
+        self.stop_background_music()
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    game = Game()
+    multiprocessing.freeze_support()  # Processos de geração de sprites no executável empacotado
+    parser = argparse.ArgumentParser(description="Jogo de Skate 2D")
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help="atualizar só as áreas da tela que mudaram (renderização por software)")
+    parser.add_argument('--max-fps', type=int, default=MAX_FPS,
+                        help=f"limite de quadros por segundo na partida (padrão: {MAX_FPS}, 0 = sem limite)")
+    parser.add_argument('--profile-dump', metavar='ARQUIVO',
+                        help="ao sair, salvar os tempos dos últimos frames (.csv ou .json)")
+    parser.add_argument('--render-scale', type=float, default=1.0, metavar='FRAÇÃO',
+                        help="desenhar a cena em resolução interna menor (ex.: 0.5 ou 0.67) e ampliar para a janela")
+    parser.add_argument('--smooth-upscale', action='store_true',
+                        help="ampliar a cena com suavização (smoothscale), mais lento que a ampliação simples")
+    parser.add_argument('--fixed-quality', action='store_true',
+                        help="não reduzir a qualidade visual quando os quadros passarem do orçamento de 60 FPS")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="mostrar quanto levou cada fase da inicialização, até o menu aparecer")
+    args = parser.parse_args()
+    if not 0 < args.render_scale <= 1:
+        parser.error("--render-scale deve estar entre 0 (exclusivo) e 1")
+    game = Game(dirty_rects=args.dirty_rects, max_fps=args.max_fps, profile_dump=args.profile_dump,
+                profile_startup=args.profile_startup, render_scale=args.render_scale,
+                smooth_upscale=args.smooth_upscale, adaptive_quality=not args.fixed_quality)
     game.run()
 
@@ -0,0 +1,118 @@
+"""
+Cache em disco dos sprites gerados - guarda os pixels crus de cada asset
+
+A chave de cada entrada é o hash do nome do gerador, dos seus parâmetros e do
+código de sprite_generator. Quando o gerador muda, todas as chaves mudam e as
+entradas antigas são apagadas na próxima inicialização.
+"""
+import hashlib
+import inspect
+import marshal
+import os
+import re
+import shutil
+import struct
+import types
+
+import sprite_generator
+from sprite_generator import RawImage
+
+ENTRY_HEADER = struct.Struct('<4sII')  # modo, largura, altura
+ENTRY_SUFFIX = '.raw'
+# Nome das pastas de versão (o hash de generator_hash); só essas são apagadas
+VERSION_PATTERN = re.compile(r'[0-9a-f]{16}')
+
+def default_cache_dir():
+    """Pasta de cache do usuário (SKATEGAME_CACHE_DIR tem prioridade)"""
+    if os.environ.get('SKATEGAME_CACHE_DIR'):
+        return os.environ['SKATEGAME_CACHE_DIR']
+    if os.environ.get('LOCALAPPDATA'):
+        return os.path.join(os.environ['LOCALAPPDATA'], 'skateGame', 'cache')
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'skategame')
+
+def generator_hash():
+    """Hash do código dos geradores de sprites"""
+    digest = hashlib.sha256()
+    try:
+        digest.update(inspect.getsource(sprite_generator).encode('utf-8'))
+    except (OSError, TypeError):
+        # Executável empacotado sem o código-fonte: usar o bytecode das funções
+        for name, value in sorted(vars(sprite_generator).items()):
+            if isinstance(value, types.FunctionType) and value.__module__ == sprite_generator.__name__:
+                digest.update(name.encode('utf-8'))
+                digest.update(marshal.dumps(value.__code__))
+    return digest.hexdigest()[:16]
+
+class SpriteCache:
+    """Guarda e recupera RawImages em disco, uma entrada por asset"""
+    def __init__(self, directory=None):
+        self.root = directory or default_cache_dir()
+        self.version = generator_hash()
+        self.directory = os.path.join(self.root, self.version)
+        self.hits = 0
+        self.misses = 0
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._remove_stale_versions()
+        except OSError as e:
+            print(f"Cache de sprites desativado: {e}")
+            self.directory = None
+
+    def _remove_stale_versions(self):
+        # Entradas geradas por outra versão dos geradores não servem mais. A
+        # pasta pode ter sido escolhida pelo usuário: outras pastas ficam intactas
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if (name != self.version and VERSION_PATTERN.fullmatch(name)
+                    and os.path.isdir(path)):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _path(self, name, params):
+        key = hashlib.sha256(repr((name, params)).encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def contains(self, name, params=()):
+        """Se há entrada guardada (sem ler os pixels)"""
+        return self.directory is not None and os.path.exists(self._path(name, params))
+
+    def load(self, name, params=()):
+        """Retorna o RawImage guardado ou None se não houver entrada válida"""
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(name, params), 'rb') as f:
+                data = f.read()
+            mode, width, height = ENTRY_HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            self.misses += 1
+            return None
+        mode = mode.decode('ascii').strip()
+        pixels = memoryview(data)[ENTRY_HEADER.size:]
+        if len(pixels) != width * height * len(mode):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return RawImage(pixels, (width, height), mode)
+
+    def store(self, name, params, raw):
+        if self.directory is None:
+            return
+        path = self._path(name, params)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(ENTRY_HEADER.pack(raw.mode.ljust(4).encode('ascii'), *raw.size))
+                f.write(raw.data)
+            # Troca atômica: outro processo nunca lê uma entrada pela metade
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Erro ao salvar sprite no cache: {e}")
+
+    def get(self, name, render, *params):
+        """RawImage do cache ou, se ausente, gerado por render(*params) e guardado"""
+        raw = self.load(name, params)
+        if raw is None:
+            raw = render(*params)
+            self.store(name, params, raw)
+        return raw
@@ -1,13 +1,48 @@
 import pygame
-from PIL import Image, ImageDraw, ImageFilter
-import os
-import random
+import numpy as np
+from collections import namedtuple
+
+# Pixels crus de um sprite (bytes no formato `mode`), prontos para cache ou pygame
+RawImage = namedtuple('RawImage', ['data', 'size', 'mode'])
+
+# Poses do jogador geradas por render_player_pose
+PLAYER_STATES = ['idle', 'ollie', 'kickflip', 'grind']
+
+def new_canvas(mode, size, color):
+    """Imagem PIL e seu ImageDraw
+
+    O PIL só é importado aqui, quando um sprite é gerado de fato: com o cache
+    ou o pacote de assets em dia, o jogo nem chega a carregá-lo.
+    """
+    from PIL import Image, ImageDraw
+    img = Image.new(mode, size, color)
+    return img, ImageDraw.Draw(img)
+
+def to_raw(img):
+    """Extrai os pixels de uma imagem PIL"""
+    return RawImage(img.tobytes(), img.size, img.mode)
+
+def array_to_raw(pixels, mode):
+    """Pixels de um array (altura, largura, canais) sem copiar o buffer"""
+    pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+    height, width = pixels.shape[:2]
+    return RawImage(memoryview(pixels).cast('B'), (width, height), mode)
+
+def to_surface(raw):
+    """Converte pixels crus em superfície pygame no formato da tela"""
+    surface = pygame.image.frombuffer(raw.data, raw.size, raw.mode)
+    if raw.mode == 'RGBA':
+        return surface.convert_alpha()
+    return surface.convert()
 
 def create_player_sprite(width=60, height=80):
     """Cria um sprite de skatista"""
+    return to_surface(render_player_sprite(width, height))
+
+def render_player_sprite(width=60, height=80):
+    """Desenha o sprite de skatista e retorna os pixels"""
     # Criar imagem com transparência
-    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img, draw = new_canvas('RGBA', (width, height), (0, 0, 0, 0))
     
     # Cabeça com mais detalhes
     head_y = 3
@@ -101,19 +136,26 @@ def create_player_sprite(width=60, height=80):
     draw.ellipse([width - 15, wheel_y + 1, width - 11, wheel_y + wheel_size - 1], fill=(40, 40, 40, 255))  # Aro
     draw.ellipse([width - 14, wheel_y + 2, width - 12, wheel_y + wheel_size - 2], fill=(60, 60, 60, 255))  # Aro interno
     
-    # Converter para superfície pygame
-    return pygame.image.fromstring(img.tobytes(), img.size, img.mode).convert_alpha()
+    return to_raw(img)
 
 def create_player_sprites_animated():
     """Cria múltiplos frames para animação do jogador"""
-    sprites = {}
-    
+    return {state: to_surface(render_player_pose(state)) for state in PLAYER_STATES}
+
+def render_player_pose(state):
+    """Desenha uma das poses do jogador (ver PLAYER_STATES) e retorna os pixels"""
+    if state == 'ollie':
+        return _render_ollie_pose()
+    elif state == 'kickflip':
+        return _render_kickflip_pose()
+    elif state == 'grind':
+        return _render_grind_pose()
     # Sprite idle/andando
-    sprites['idle'] = create_player_sprite()
-    
+    return render_player_sprite()
+
+def _render_ollie_pose():
     # Sprite ollie (pulando) - mais realista
-    img = Image.new('RGBA', (60, 80), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img, draw = new_canvas('RGBA', (60, 80), (0, 0, 0, 0))
     
     # Cabeça
     draw.ellipse([21, 0, 39, 18], fill=(255, 220, 177, 255))
@@ -155,11 +197,11 @@ def create_player_sprites_animated():
     draw.ellipse([42, board_y + 12, 48, board_y + 18], fill=(0, 0, 0, 255))
     draw.ellipse([43, board_y + 13, 47, board_y + 17], fill=(40, 40, 40, 255))
     
-    sprites['ollie'] = pygame.image.fromstring(img.tobytes(), img.size, img.mode).convert_alpha()
-    
+    return to_raw(img)
+
+def _render_kickflip_pose():
     # Sprite kickflip - mais realista
-    img = Image.new('RGBA', (60, 80), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img, draw = new_canvas('RGBA', (60, 80), (0, 0, 0, 0))
     
     # Cabeça
     draw.ellipse([21, 0, 39, 18], fill=(255, 220, 177, 255))
@@ -201,11 +243,11 @@ def create_player_sprites_animated():
     draw.ellipse([37, board_y + 12, 43, board_y + 18], fill=(0, 0, 0, 255))
     draw.ellipse([38, board_y + 13, 42, board_y + 17], fill=(40, 40, 40, 255))
     
-    sprites['kickflip'] = pygame.image.fromstring(img.tobytes(), img.size, img.mode).convert_alpha()
-    
+    return to_raw(img)
+
+def _render_grind_pose():
     # Sprite grind (agachado) - mais realista
-    img = Image.new('RGBA', (60, 80), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img, draw = new_canvas('RGBA', (60, 80), (0, 0, 0, 0))
     
     # Cabeça
     draw.ellipse([21, 10, 39, 28], fill=(255, 220, 177, 255))
@@ -247,14 +289,15 @@ def create_player_sprites_animated():
     draw.ellipse([42, board_y + 12, 48, board_y + 18], fill=(0, 0, 0, 255))
     draw.ellipse([43, board_y + 13, 47, board_y + 17], fill=(40, 40, 40, 255))
     
-    sprites['grind'] = pygame.image.fromstring(img.tobytes(), img.size, img.mode).convert_alpha()
-    
-    return sprites
+    return to_raw(img)
 
 def create_obstacle_sprite(obstacle_type, width, height):
     """Cria sprites de obstáculos"""
-    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    return to_surface(render_obstacle_sprite(obstacle_type, width, height))
+
+def render_obstacle_sprite(obstacle_type, width, height):
+    """Desenha um obstáculo e retorna os pixels"""
+    img, draw = new_canvas('RGBA', (width, height), (0, 0, 0, 0))
     
     if obstacle_type == 'barrier':
         # Barreira vermelha com listras de aviso
@@ -271,104 +314,8 @@ def create_obstacle_sprite(obstacle_type, width, height):
         draw.rectangle([0, 0, width, height], outline=(0, 0, 0, 255), width=2)
         
     elif obstacle_type == 'ramp':
-        # Rampa de skate realista com curvas suaves
-        # Cor base - cinza de concreto
-        concrete_base = (180, 180, 180, 255)
-        concrete_dark = (150, 150, 150, 255)
-        concrete_light = (200, 200, 200, 255)
-        coping_color = (100, 100, 100, 255)  # Coping metálico no topo
-        
-        # Criar rampa com curvas suaves usando múltiplos polígonos/arcos
-        # Lado esquerdo (aproximação)
-        left_points = []
-        for x in range(0, width//2 + 1):
-            # Curva suave: easing quadrático
-            progress = x / (width//2)
-            # Fórmula de curva para transição suave
-            y_offset = height * (1 - progress * progress)
-            left_points.append((x, int(y_offset)))
-        left_points.append((width//2, 0))
-        left_points.append((0, height))
-        left_points.append((0, 0))
-        
-        # Lado direito (aterrissagem)
-        right_points = []
-        for x in range(width//2, width + 1):
-            progress = (x - width//2) / (width//2)
-            y_offset = height * (progress * progress)
-            right_points.append((x, int(y_offset)))
-        right_points.append((width, height))
-        right_points.append((width//2, 0))
-        right_points.append((width, 0))
-        
-        # Desenhar superfície da rampa com textura de concreto
-        # Preenchimento base
-        all_points = [(0, height), (width, height), (width//2, 0)]
-        draw.polygon(all_points, fill=concrete_base)
-        
-        # Adicionar linhas de textura (superfície de concreto)
-        for i in range(0, width, 3):
-            if i < width//2:
-                progress = i / (width//2)
-                y_pos = int(height * (1 - progress * progress))
-            else:
-                progress = (i - width//2) / (width//2)
-                y_pos = int(height * (progress * progress))
-            # Linhas de textura sutis
-            if i % 6 == 0:
-                draw.line([(i, y_pos), (i, height)], fill=concrete_dark, width=1)
-        
-        # Adicionar sombreamento para efeito 3D
-        # Sombra do lado esquerdo
-        for i in range(0, width//2, 2):
-            progress = i / (width//2)
-            y_pos = int(height * (1 - progress * progress))
-            draw.line([(i, y_pos), (i, height)], fill=concrete_dark, width=1)
-        
-        # Destaque do lado direito
-        for i in range(width//2, width, 2):
-            progress = (i - width//2) / (width//2)
-            y_pos = int(height * (progress * progress))
-            draw.line([(i, y_pos), (i, height)], fill=concrete_light, width=1)
-        
-        # Coping superior (borda metálica) - topo arredondado
-        coping_width = 4
-        coping_rect = [width//2 - 10, -coping_width, width//2 + 10, coping_width + 2]
-        draw.ellipse(coping_rect, fill=coping_color)
-        # Contorno do coping
-        draw.arc([width//2 - 10, -coping_width, width//2 + 10, coping_width + 2], 
-                 start=0, end=180, fill=(60, 60, 60, 255), width=2)
-        # Linha inferior do coping
-        draw.line([(width//2 - 10, 0), (width//2 + 10, 0)], fill=(60, 60, 60, 255), width=1)
-        
-        # Bordas laterais (suportes verticais)
-        edge_width = 2
-        # Borda esquerda
-        draw.rectangle([0, 0, edge_width, height], fill=(120, 120, 120, 255))
-        draw.rectangle([0, 0, edge_width, height], outline=(80, 80, 80, 255), width=1)
-        # Borda direita
-        draw.rectangle([width - edge_width, 0, width, height], fill=(120, 120, 120, 255))
-        draw.rectangle([width - edge_width, 0, width, height], outline=(80, 80, 80, 255), width=1)
-        
-        # Contorno
-        draw.polygon(all_points, outline=(100, 100, 100, 255), width=2)
-        
-        # Adicionar algumas linhas de construção/detalhes
-        for i in range(1, 4):
-            line_y = height - (i * height // 4)
-            if line_y > 0:
-                # Encontrar posições x para este nível y na curva
-                for x in range(0, width, 2):
-                    if x < width//2:
-                        progress = x / (width//2)
-                        curve_y = int(height * (1 - progress * progress))
-                    else:
-                        progress = (x - width//2) / (width//2)
-                        curve_y = int(height * (progress * progress))
-                    
-                    if abs(curve_y - line_y) < 2:
-                        draw.ellipse([x-1, curve_y-1, x+1, curve_y+1], 
-                                   fill=(140, 140, 140, 150))
+        # Rampa: gerada direto num array (ver render_ramp_pixels)
+        return array_to_raw(render_ramp_pixels(width, height), 'RGBA')
         
     elif obstacle_type == 'rail':
         # Rail cinza com brilho metálico
@@ -380,12 +327,15 @@ def create_obstacle_sprite(obstacle_type, width, height):
         draw.rectangle([0, height, 3, height + 5], fill=(100, 100, 100, 255))
         draw.rectangle([width-3, height, width, height + 5], fill=(100, 100, 100, 255))
     
-    return pygame.image.fromstring(img.tobytes(), img.size, img.mode).convert_alpha()
+    return to_raw(img)
 
 def create_background(width, height):
     """Cria um fundo realista"""
-    img = Image.new('RGB', (width, height), (135, 206, 235))  # Azul céu
-    draw = ImageDraw.Draw(img)
+    return to_surface(render_background(width, height))
+
+def render_background(width, height):
+    """Desenha o fundo e retorna os pixels"""
+    img, draw = new_canvas('RGB', (width, height), (135, 206, 235))  # Azul céu
     
     # Nuvens
     for i in range(3):
@@ -399,30 +349,112 @@ def create_background(width, height):
     # Sol
     draw.ellipse([width - 100, 30, width - 30, 100], fill=(255, 255, 150, 255))
     
-    return pygame.image.fromstring(img.tobytes(), img.size, img.mode).convert()
+    return to_raw(img)
 
 def create_ground_sprite(width, height):
     """Cria uma textura de chão realista"""
-    img = Image.new('RGB', (width, height), (50, 200, 50))
-    draw = ImageDraw.Draw(img)
-    
-    # Textura de grama
-    for i in range(0, width, 2):
-        for j in range(0, height, 3):
-            # Folhas de grama aleatórias
-            if (i + j) % 7 < 2:
-                draw.line([(i, j), (i + random.randint(-1, 1), j - 2)], 
-                         fill=(40, 180, 40), width=1)
+    return to_surface(render_ground_sprite(width, height))
+
+def render_ground_sprite(width, height, seed=0):
+    """Gera a textura de chão num array e retorna os pixels"""
+    pixels = np.empty((height, width, 3), dtype=np.uint8)
+    pixels[:] = (50, 200, 50)
+    
+    # Textura de grama: uma folha a cada célula 2x3 onde (x + y) % 7 < 2,
+    # do pé (x, y) até (x + inclinação, y - 2), com inclinação -1, 0 ou 1
+    x, y = np.meshgrid(np.arange(0, width, 2), np.arange(0, height, 3))
+    blades = (x + y) % 7 < 2
+    x, y = x[blades], y[blades]
+    tilt = np.random.default_rng(seed).integers(-1, 2, size=x.size)
+    for blade_x, blade_y in ((x, y), (x + tilt, y - 1), (x + tilt, y - 2)):
+        inside = (blade_x >= 0) & (blade_x < width) & (blade_y >= 0)
+        pixels[blade_y[inside], blade_x[inside]] = (40, 180, 40)
     
     # Estrada/caminho no meio
     road_width = width // 3
     road_x = width // 2 - road_width // 2
-    draw.rectangle([road_x, 0, road_x + road_width, height], fill=(80, 80, 80, 255))
+    pixels[:, road_x:road_x + road_width + 1] = (80, 80, 80)
     # Linhas da estrada
+    center = road_x + road_width // 2
     for i in range(0, height, 20):
-        draw.rectangle([road_x + road_width // 2 - 15, i, 
-                       road_x + road_width // 2 + 15, i + 10], 
-                      fill=(255, 255, 0, 255))
+        pixels[i:i + 11, max(center - 15, 0):center + 16] = (255, 255, 0)
     
-    return pygame.image.fromstring(img.tobytes(), img.size, img.mode).convert()
+    return array_to_raw(pixels, 'RGB')
+
+# Cores da rampa, indexadas pela imagem de rótulos de render_ramp_pixels
+RAMP_PALETTE = np.array([
+    (0, 0, 0, 0),            # Transparente
+    (180, 180, 180, 255),    # Concreto
+    (150, 150, 150, 255),    # Concreto escuro (textura e sombra)
+    (200, 200, 200, 255),    # Concreto claro (destaque)
+    (100, 100, 100, 255),    # Coping metálico e contorno
+    (60, 60, 60, 255),       # Contorno do coping
+    (120, 120, 120, 255),    # Suportes laterais
+    (80, 80, 80, 255),       # Contorno dos suportes
+    (140, 140, 140, 150)     # Pontos das linhas de construção
+], dtype=np.uint8)
+(RAMP_CLEAR, RAMP_CONCRETE, RAMP_DARK, RAMP_LIGHT, RAMP_METAL,
+ RAMP_COPING_EDGE, RAMP_SUPPORT, RAMP_SUPPORT_EDGE, RAMP_DOT) = range(len(RAMP_PALETTE))
+
+def render_ramp_pixels(width, height):
+    """Rampa de skate (concreto com curvas suaves) como array RGBA (altura, largura, 4)
 
+    As camadas são pintadas numa imagem de rótulos de 1 byte por pixel, que
+    vira RGBA numa única consulta à RAMP_PALETTE no final.
+    """
+    half = width // 2
+    labels = np.zeros((height, width), dtype=np.uint8)
+    rows = np.arange(height, dtype=np.float32)[:, None]
+    x = np.arange(width)
+    
+    # Curva de cada coluna: subida com easing quadrático até o topo, descida espelhada
+    progress = x / half
+    curve = np.where(x < half, height * (1 - progress * progress), height * (progress - 1) ** 2).astype(int)
+    below_curve = np.arange(height)[:, None] >= curve
+    
+    # Preenchimento base: triângulo (0, altura), (largura, altura), (meio, 0)
+    slope = height / half
+    left_edge = (height - x * slope).astype(np.float32)
+    right_edge = ((x - half) * slope).astype(np.float32)
+    triangle = rows >= np.maximum(left_edge, right_edge)
+    labels[triangle] = RAMP_CONCRETE
+    
+    # Linhas de textura (a cada 6 colunas), sombra do lado esquerdo e
+    # destaque do lado direito (a cada 2), da curva até a base
+    column_shade = np.zeros(width, dtype=np.uint8)
+    column_shade[(x % 6 == 0) | ((x % 2 == 0) & (x < half))] = RAMP_DARK
+    column_shade[(x % 2 == 0) & (x >= half)] = RAMP_LIGHT
+    np.copyto(labels, column_shade, where=below_curve & (column_shade > 0))
+    
+    # Coping superior (borda metálica): elipse no topo com contorno na metade de baixo
+    top = min(height, 7)
+    coping_x = slice(max(half - 10, 0), half + 11)
+    dx = (x[coping_x] - half) / 10
+    dy = (np.arange(top)[:, None] - 1) / 5
+    coping = dx * dx + dy * dy
+    labels[:top, coping_x][coping <= 1] = RAMP_METAL
+    labels[:top, coping_x][(coping <= 1) & (coping > 0.55) & (dy >= 0)] = RAMP_COPING_EDGE
+    labels[0, coping_x] = RAMP_COPING_EDGE
+    
+    # Bordas laterais (suportes verticais): miolo claro, contorno escuro
+    labels[:, :3] = RAMP_SUPPORT_EDGE
+    labels[:, -2:] = RAMP_SUPPORT_EDGE
+    labels[1:, 1] = RAMP_SUPPORT
+    labels[1:, -1] = RAMP_SUPPORT
+    
+    # Contorno do triângulo: 2px para dentro das bordas inclinadas, 1px na base
+    outline = triangle & (rows < np.maximum(left_edge, right_edge) + 2 * slope)
+    outline[-1] |= triangle[-1]
+    labels[outline] = RAMP_METAL
+    
+    # Linhas de construção: pontos onde a curva cruza 1/4, 2/4 e 3/4 da altura
+    for i in range(1, 4):
+        line_y = height - (i * height // 4)
+        for dot_x in np.nonzero((np.abs(curve - line_y) < 2) & (x % 2 == 0))[0]:
+            dot_y = curve[dot_x]
+            for px, py in ((dot_x, dot_y), (dot_x - 1, dot_y), (dot_x + 1, dot_y),
+                           (dot_x, dot_y - 1), (dot_x, dot_y + 1)):
+                if 0 <= px < width and 0 <= py < height:
+                    labels[py, px] = RAMP_DOT
+    
+    return RAMP_PALETTE.take(labels, axis=0)